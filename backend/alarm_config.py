@@ -3,195 +3,425 @@ Alarm Type Configuration Manager
 Manages alarm types through JSON file storage
 """
 
+import functools
 import json
+import logging
 import os
 import sys
-from typing import List, Dict
+import threading
+from contextlib import contextmanager
+from typing import Any, List, Dict, Optional, Tuple
 from pathlib import Path
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj, pretty: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+except ImportError:  # orjson is optional; fall back to stdlib json
+    _json_loads = json.loads
+
+    def _json_dumps(obj, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+logger = logging.getLogger(__name__)
+
+# Resolved once at import; neither location changes for the life of the process
+_SCRIPT_DIR = Path(__file__).parent
+_EXE_DIR = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else None
+
+# Config keys, interned once and shared by every lookup
+_KEY_CURRENT = sys.intern("current_alarm_types")
+_KEY_DEFAULT = sys.intern("default_alarm_types")
+_KEY_EXTRACTION = sys.intern("extraction_settings")
+_KEY_CHANNELS = sys.intern("alarm_type_channels")
+
+_DEFAULT_ALARM_TYPES = (
+    "Dump Bed Cannot Be Raised While Vehicle Tilted",
+    "Tilt exceeded with dump bed raised",
+    "Off Path",
+    "Steering Restricted",
+    "Bump Detected: Dump",
+    "Bump Detected: Close",
+    "Undocumented Error c419",
+    "Failed to Drive When Commanded",
+    "Slippery Conditions Caused Vehicle To Stop"
+)
+
+_DEFAULT_EXTRACTION_SETTINGS = {
+    "query_delay_seconds": 0.1,
+    "max_points_per_query": 1000,
+    "telemetry_window_seconds": 0.5,
+    "description": "Configurable settings for data extraction. query_delay_seconds is the back-off step between InfluxDB queries while the server responds slowly; queries run without delay while it keeps up. max_points_per_query caps the telemetry rows a single InfluxDB request may return. Lower values = less load per request but more round trips."
+}
+
+# Extraction settings rules: (field, accepted types, value check, error message)
+_EXTRACTION_SETTINGS_RULES = (
+    ("query_delay_seconds", (int, float), lambda v: v >= 0,
+     "query_delay_seconds must be a non-negative number"),
+    ("max_points_per_query", int, lambda v: v >= 1,
+     "max_points_per_query must be a positive integer"),
+    ("telemetry_window_seconds", (int, float), lambda v: v >= 0,
+     "telemetry_window_seconds must be a non-negative number"),
+)
+
+def _validate_extraction_settings(settings: Dict):
+    """Raise ValueError if settings are missing fields or out of range"""
+    for field, _, _, _ in _EXTRACTION_SETTINGS_RULES:
+        if field not in settings:
+            raise ValueError(f"Missing required field: {field}")
+
+    for field, types, check, message in _EXTRACTION_SETTINGS_RULES:
+        value = settings[field]
+        if not isinstance(value, types) or not check(value):
+            raise ValueError(message)
+
+# Delay before retrying a coalesced write that failed
+_FLUSH_RETRY_SECONDS = 5.0
+
+# Parsed configs shared by every manager, keyed by path:
+# path -> (mtime_ns, config, immutable views derived from config)
+_config_cache: Dict[str, Tuple[int, Dict, Dict[str, Tuple[str, ...]]]] = {}
+
+def _read_config_file(config_path: Path) -> Dict:
+    """Parse a JSON config file, reusing the cached result until its mtime changes"""
+    key = os.fspath(config_path)
+    mtime_ns = os.stat(key).st_mtime_ns
+    cached = _config_cache.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    config = _json_loads(config_path.read_bytes())
+    _check_config_shape(config, key)
+    _config_cache[key] = (mtime_ns, config, {})
+    return config
+
+def _check_config_shape(config: Any, source: str):
+    """Validate a freshly parsed config once, so cached reads can trust it"""
+    if not isinstance(config, dict):
+        raise ValueError(f"{source}: top-level value must be an object")
+
+    for field in (_KEY_CURRENT, _KEY_DEFAULT):
+        value = config.get(field, [])
+        if not isinstance(value, list) or not all(isinstance(t, str) for t in value):
+            raise ValueError(f"{source}: {field} must be a list of strings")
+
+    channels = config.get(_KEY_CHANNELS, {})
+    if not isinstance(channels, dict) or not all(
+            isinstance(v, list) and all(isinstance(c, str) for c in v) for v in channels.values()):
+        raise ValueError(f"{source}: {_KEY_CHANNELS} must map alarm types to lists of channel names")
+
+    settings = config.get(_KEY_EXTRACTION)
+    if settings is not None:
+        try:
+            _validate_extraction_settings(settings)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"{source}: invalid extraction_settings: {e}")
+
+def _read_config_view(config_path: Path, field: str) -> Tuple[str, ...]:
+    """Get a list field of a config file as a tuple, built once per file version"""
+    config = _read_config_file(config_path)
+    views = _config_cache[os.fspath(config_path)][2]
+    view = views.get(field)
+    if view is None:
+        view = views[field] = tuple(config.get(field, []))
+    return view
+
+def _write_config_file(config_path: Path, config: Dict, pretty: bool = False):
+    """Atomically write a JSON config file and prime the shared cache with it
+
+    The file is written to a temporary sibling and swapped in with
+    os.replace so a crash mid-write never leaves a truncated config.
+    """
+    key = os.fspath(config_path)
+    try:
+        tmp_file = config_path.with_suffix('.json.tmp')
+        tmp_file.write_bytes(_json_dumps(config, pretty))
+        os.replace(tmp_file, key)
+    except Exception:
+        # Callers mutate the cached dict before saving; drop it on failure
+        _config_cache.pop(key, None)
+        raise
+    # Keep our own write in the cache so it isn't re-read from disk
+    _config_cache[key] = (os.stat(key).st_mtime_ns, config, {})
+
 class AlarmTypeManager:
-    def __init__(self, config_file: str = "alarm_types.json"):
+    def __init__(self, config_file: str = "alarm_types.json", write_delay: float = 0.1):
         # Try external file first (same directory as executable), then embedded
-        if getattr(sys, 'frozen', False):
+        if _EXE_DIR is not None:
             # Running as compiled executable
-            executable_dir = Path(sys.executable).parent
-            external_config = executable_dir / config_file
-            if external_config.exists():
-                self.config_file = external_config
-                print(f"Using external config: {self.config_file}")
+            external_config = os.path.join(_EXE_DIR, config_file)
+            if os.path.exists(external_config):
+                self.config_file = Path(external_config)
+                logger.info(f"Using external config: {self.config_file}")
             else:
                 # Fall back to embedded config
-                self.config_file = Path(__file__).parent / config_file
-                print(f"Using embedded config: {self.config_file}")
+                self.config_file = _SCRIPT_DIR / config_file
+                logger.info(f"Using embedded config: {self.config_file}")
         else:
             # Running as Python script
-            self.config_file = Path(__file__).parent / config_file
-            print(f"Using script config: {self.config_file}")
+            self.config_file = _SCRIPT_DIR / config_file
+            logger.info(f"Using script config: {self.config_file}")
+        self._config_path_str = os.fspath(self.config_file)
+
+        # Unwritten mutations (from batch() or the write coalescer) are held
+        # here; readers see them immediately, disk catches up on flush
+        self._in_batch = False
+        self._pending_config: Optional[Dict] = None
+
+        # Writes landing within write_delay seconds are coalesced into one
+        self._write_delay = write_delay
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+
+        # Defaults served while the config file is unreadable, built once
+        self._fallback_config: Optional[Dict] = None
 
         self._ensure_config_exists()
+        self._load_config()  # Parse and validate once up front
     
     def _ensure_config_exists(self):
         """Create config file with defaults if it doesn't exist"""
-        if not self.config_file.exists():
+        if not os.path.exists(self._config_path_str):
             default_config = self._get_default_config()
-            self._save_config(default_config)
+            self._save_config(default_config, pretty=True)
     
     def _load_config(self) -> Dict:
-        """Load configuration from JSON file"""
+        """Load configuration from JSON file (cached until the file changes)"""
+        if self._pending_config is not None:
+            return self._pending_config
+
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _read_config_file(self.config_file)
         except Exception as e:
-            print(f"Error loading alarm config: {e}")
-            return self._get_default_config()
+            if self._fallback_config is None:
+                logger.error(f"Error loading alarm config: {e}")
+                self._fallback_config = self._get_default_config()
+            return self._fallback_config
     
-    def _save_config(self, config: Dict):
-        """Save configuration to JSON file"""
+    def _save_config(self, config: Dict, pretty: bool = False):
+        """Save configuration to JSON file (deferred inside batch() or when coalescing)"""
+        if self._in_batch:
+            self._pending_config = config
+            return
+
+        if self._write_delay > 0 and not pretty:
+            with self._flush_lock:
+                self._pending_config = config
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self._write_delay, self._flush)
+                    self._flush_timer.start()
+            return
+
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            _write_config_file(self.config_file, config, pretty)
         except Exception as e:
-            print(f"Error saving alarm config: {e}")
+            logger.error(f"Error saving alarm config: {e}")
             raise
+
+    def _flush(self, raise_errors: bool = False):
+        """Write any pending config to disk, keeping it for a retry if the write fails"""
+        with self._flush_lock:
+            self._flush_timer = None
+            pending = self._pending_config
+            if pending is None:
+                return
+            try:
+                _write_config_file(self.config_file, pending)
+            except Exception as e:
+                logger.error(f"Error saving alarm config (retrying in {_FLUSH_RETRY_SECONDS}s): {e}")
+                self._flush_timer = threading.Timer(_FLUSH_RETRY_SECONDS, self._flush)
+                self._flush_timer.daemon = True  # Don't hold up interpreter exit
+                self._flush_timer.start()
+                if raise_errors:
+                    raise
+                return
+            self._pending_config = None
+
+    def flush_now(self):
+        """Cancel any scheduled write and flush pending changes immediately
+
+        Raises the write error if the pending config could not be saved; it
+        stays pending and is retried in the background.
+        """
+        with self._flush_lock:
+            timer = self._flush_timer
+        if timer is not None:
+            timer.cancel()
+        self._flush(raise_errors=True)
     
+    @contextmanager
+    def batch(self):
+        """Group several mutations into a single config write"""
+        if self._in_batch:
+            yield self
+            return
+
+        self._in_batch = True
+        try:
+            yield self
+        finally:
+            self._in_batch = False
+            pending, self._pending_config = self._pending_config, None
+            if pending is not None:
+                self._save_config(pending)
+
     def _get_default_config(self) -> Dict:
-        """Get default configuration"""
+        """Get a fresh, mutable copy of the default configuration"""
         return {
-            "default_alarm_types": [
-                "Dump Bed Cannot Be Raised While Vehicle Tilted",
-                "Tilt exceeded with dump bed raised",
-                "Off Path",
-                "Steering Restricted",
-                "Bump Detected: Dump",
-                "Bump Detected: Close",
-                "Undocumented Error c419",
-                "Failed to Drive When Commanded",
-                "Slippery Conditions Caused Vehicle To Stop"
-            ],
-            "current_alarm_types": [
-                "Dump Bed Cannot Be Raised While Vehicle Tilted",
-                "Tilt exceeded with dump bed raised",
-                "Off Path",
-                "Steering Restricted",
-                "Bump Detected: Dump",
-                "Bump Detected: Close",
-                "Undocumented Error c419",
-                "Failed to Drive When Commanded",
-                "Slippery Conditions Caused Vehicle To Stop"
-            ],
-            "extraction_settings": {
-                "query_delay_seconds": 0.1,
-                "max_points_per_query": 1000,
-                "telemetry_window_seconds": 0.5,
-                "description": "Configurable settings for data extraction. query_delay_seconds controls the delay between InfluxDB queries to protect server performance. Lower values = faster extraction but higher server load."
-            }
+            _KEY_DEFAULT: list(_DEFAULT_ALARM_TYPES),
+            _KEY_CURRENT: list(_DEFAULT_ALARM_TYPES),
+            _KEY_EXTRACTION: dict(_DEFAULT_EXTRACTION_SETTINGS),
+            _KEY_CHANNELS: {}
         }
     
-    def get_current_alarm_types(self) -> List[str]:
+    def _get_alarm_types_view(self, field: str) -> Tuple[str, ...]:
+        """Get an alarm type list as a shared, immutable tuple"""
+        if self._pending_config is None:
+            try:
+                return _read_config_view(self.config_file, field)
+            except Exception:
+                pass  # _load_config below logs and serves the fallback
+        return tuple(self._load_config().get(field, []))
+
+    def get_current_alarm_types(self) -> Tuple[str, ...]:
         """Get current alarm types list"""
-        config = self._load_config()
-        return config.get("current_alarm_types", [])
+        return self._get_alarm_types_view(_KEY_CURRENT)
     
-    def get_default_alarm_types(self) -> List[str]:
+    def get_default_alarm_types(self) -> Tuple[str, ...]:
         """Get default alarm types list"""
-        config = self._load_config()
-        return config.get("default_alarm_types", [])
+        return self._get_alarm_types_view(_KEY_DEFAULT)
     
     def set_alarm_types(self, alarm_types: List[str]) -> bool:
         """Set current alarm types list"""
         try:
             config = self._load_config()
-            config["current_alarm_types"] = alarm_types
+            new_types = list(dict.fromkeys(alarm_types))
+            if config.get(_KEY_CURRENT) == new_types:
+                return True
+            config[_KEY_CURRENT] = new_types
             self._save_config(config)
             return True
         except Exception as e:
-            print(f"Error setting alarm types: {e}")
+            logger.error(f"Error setting alarm types: {e}")
             return False
     
     def add_alarm_type(self, alarm_type: str) -> bool:
         """Add a new alarm type to current list"""
+        return self.add_alarm_types([alarm_type])
+
+    def add_alarm_types(self, alarm_types: List[str]) -> bool:
+        """Add several alarm types to current list with a single write"""
         try:
             config = self._load_config()
-            current_types = config.get("current_alarm_types", [])
-            if alarm_type not in current_types:
-                current_types.append(alarm_type)
-                config["current_alarm_types"] = current_types
+            current_types = config.get(_KEY_CURRENT, [])
+            existing = set(current_types)
+            added = False
+            for alarm_type in alarm_types:
+                if alarm_type not in existing:
+                    current_types.append(alarm_type)
+                    existing.add(alarm_type)
+                    added = True
+            if added:
+                config[_KEY_CURRENT] = current_types
                 self._save_config(config)
             return True
         except Exception as e:
-            print(f"Error adding alarm type: {e}")
+            logger.error(f"Error adding alarm types: {e}")
             return False
-    
+
     def remove_alarm_type(self, alarm_type: str) -> bool:
         """Remove an alarm type from current list"""
+        return self.remove_alarm_types([alarm_type])
+
+    def remove_alarm_types(self, alarm_types: List[str]) -> bool:
+        """Remove several alarm types from current list with a single write"""
         try:
             config = self._load_config()
-            current_types = config.get("current_alarm_types", [])
-            if alarm_type in current_types:
-                current_types.remove(alarm_type)
-                config["current_alarm_types"] = current_types
+            current_types = config.get(_KEY_CURRENT, [])
+            to_remove = set(alarm_types)
+            remaining = [t for t in current_types if t not in to_remove]
+            if len(remaining) != len(current_types):
+                config[_KEY_CURRENT] = remaining
                 self._save_config(config)
             return True
         except Exception as e:
-            print(f"Error removing alarm type: {e}")
+            logger.error(f"Error removing alarm types: {e}")
             return False
     
     def reset_to_defaults(self) -> bool:
         """Reset current alarm types to defaults"""
         try:
             config = self._load_config()
-            config["current_alarm_types"] = config["default_alarm_types"].copy()
+            default_types = list(config.get(_KEY_DEFAULT, _DEFAULT_ALARM_TYPES))
+            if config.get(_KEY_CURRENT) == default_types:
+                return True
+            config[_KEY_CURRENT] = default_types
             self._save_config(config)
             return True
         except Exception as e:
-            print(f"Error resetting to defaults: {e}")
+            logger.error(f"Error resetting to defaults: {e}")
             return False
     
     def get_stats(self) -> Dict:
         """Get statistics about alarm types"""
-        config = self._load_config()
-        current_types = config.get("current_alarm_types", [])
-        default_types = config.get("default_alarm_types", [])
+        current_types = self.get_current_alarm_types()
+        default_types = self.get_default_alarm_types()
+        is_using_defaults = current_types == default_types
+
+        if is_using_defaults:
+            custom_additions, removed_defaults = [], []
+        else:
+            current_set = set(current_types)
+            default_set = set(default_types)
+            custom_additions = [t for t in current_types if t not in default_set]
+            removed_defaults = [t for t in default_types if t not in current_set]
 
         return {
             "current_count": len(current_types),
             "default_count": len(default_types),
-            "is_using_defaults": current_types == default_types,
-            "custom_additions": [t for t in current_types if t not in default_types],
-            "removed_defaults": [t for t in default_types if t not in current_types]
+            "is_using_defaults": is_using_defaults,
+            "custom_additions": custom_additions,
+            "removed_defaults": removed_defaults
         }
 
     def get_extraction_settings(self) -> Dict:
-        """Get extraction settings"""
-        config = self._load_config()
-        default_settings = self._get_default_config()["extraction_settings"]
-        return config.get("extraction_settings", default_settings)
+        """Get a copy of the extraction settings"""
+        settings = self._load_config().get(_KEY_EXTRACTION)
+        return dict(settings if settings is not None else _DEFAULT_EXTRACTION_SETTINGS)
+
+    def get_alarm_type_channels(self) -> Dict[str, List[str]]:
+        """Get a copy of the telemetry channels fetched per alarm type (unlisted types get every channel)"""
+        return {alarm_type: list(channels) for alarm_type, channels in self._load_config().get(_KEY_CHANNELS, {}).items()}
 
     def update_extraction_settings(self, settings: Dict) -> bool:
         """Update extraction settings"""
         try:
             config = self._load_config()
 
-            # Validate required fields
-            required_fields = ["query_delay_seconds", "max_points_per_query", "telemetry_window_seconds"]
-            for field in required_fields:
-                if field not in settings:
-                    raise ValueError(f"Missing required field: {field}")
-
-            # Validate types and ranges
-            if not isinstance(settings["query_delay_seconds"], (int, float)) or settings["query_delay_seconds"] < 0:
-                raise ValueError("query_delay_seconds must be a non-negative number")
-
-            if not isinstance(settings["max_points_per_query"], int) or settings["max_points_per_query"] < 1:
-                raise ValueError("max_points_per_query must be a positive integer")
-
-            if not isinstance(settings["telemetry_window_seconds"], (int, float)) or settings["telemetry_window_seconds"] < 0:
-                raise ValueError("telemetry_window_seconds must be a non-negative number")
+            _validate_extraction_settings(settings)
 
             # Update config
-            config["extraction_settings"] = settings
+            if config.get(_KEY_EXTRACTION) == settings:
+                return True
+            config[_KEY_EXTRACTION] = settings
             self._save_config(config)
             return True
         except Exception as e:
-            print(f"Error updating extraction settings: {e}")
-            return False
\ No newline at end of file
+            logger.error(f"Error updating extraction settings: {e}")
+            return False
+
+_manager_lock = threading.Lock()
+
+@functools.cache
+def _create_manager(config_file: str) -> AlarmTypeManager:
+    return AlarmTypeManager(config_file)
+
+def get_manager(config_file: str = "alarm_types.json") -> AlarmTypeManager:
+    """Get the process-wide AlarmTypeManager for a config file"""
+    with _manager_lock:
+        return _create_manager(config_file)
@@ -4,50 +4,178 @@ Mining Truck Alarm Analysis - Lightweight Data Extractor
 Simple, InfluxDB-safe alarm extraction with rate limiting
 """
 
+import re
 import time
 import logging
 import threading
 import signal
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any, Callable
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 from influxdb import InfluxDBClient
+from influxdb.exceptions import InfluxDBServerError
+from influxdb.resultset import ResultSet
 import pandas as pd
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; responses then go through requests' stdlib json
+    _json_loads = None
+
+
+class ExtractionCancelled(Exception):
+    """Raised when an extraction stops because it was cancelled"""
+
+
+class FastJSONInfluxDBClient(InfluxDBClient):
+    """InfluxDBClient that decodes query responses with orjson when it is installed"""
+
+    def request(self, *args, **kwargs):
+        response = super().request(*args, **kwargs)
+        if _json_loads is not None:
+            content = response.content
+            response.json = lambda **_: _json_loads(content)
+        return response
+
+
+class QueryRateLimiter:
+    """Adaptive delay between InfluxDB queries: back off while the server is slow, recover while it is fast"""
+
+    __slots__ = ('base_delay', 'slow_query_seconds', 'max_delay', 'delay', '_lock')
+
+    def __init__(self, base_delay: float = 0.1, slow_query_seconds: float = 2.0, max_delay: float = 5.0):
+        self.base_delay = base_delay  # Additive recovery step and minimum back-off
+        self.slow_query_seconds = slow_query_seconds
+        self.max_delay = max_delay
+        self.delay = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Sleep for the current delay, if any"""
+        delay = self.delay
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_success(self, elapsed: float):
+        """Record a completed query; slow responses still count as server stress"""
+        if elapsed > self.slow_query_seconds:
+            self.on_slow()
+            return
+        with self._lock:
+            self.delay = max(0.0, self.delay - self.base_delay)
+
+    def on_slow(self):
+        """Record a timeout, server error or slow response"""
+        with self._lock:
+            self.delay = min(self.max_delay, max(self.delay * 2, self.base_delay, 0.05))
+
+
+class AdaptiveBatchSizer:
+    """Pick the next telemetry batch size from how long previous batches took"""
+
+    __slots__ = ('maximum', 'size', 'target_seconds', '_lock')
+
+    def __init__(self, initial: int = 8, maximum: int = 50, target_seconds: float = 1.0):
+        self.maximum = max(1, maximum)
+        self.size = max(1, min(initial, self.maximum))
+        self.target_seconds = target_seconds
+        self._lock = threading.Lock()
+
+    def record(self, batch_size: int, elapsed: float):
+        """Steer towards batches that take about target_seconds, halfway per step to damp noise"""
+        if batch_size <= 0:
+            return
+        ideal = self.target_seconds * batch_size / max(elapsed, 1e-3)
+        with self._lock:
+            self.size = max(1, min(self.maximum, int((self.size + ideal) / 2)))
+
+
 class AlarmDataExtractor:
     """Lightweight alarm data extractor with InfluxDB protection"""
+
+    # Fixed attribute layout: no per-instance __dict__, and a typo'd assignment fails loudly
+    __slots__ = (
+        'host', 'port', 'database', 'client', 'deg_factor', '_inv_deg_factor', 'cancelled',
+        '_query_wakeups', '_query_wakeups_lock', 'query_timeout', 'max_workers', 'thread_pool',
+        'ALARM_TYPES', '_alarm_keywords', '_unique_keywords', '_title_to_type', '_alarm_type_set',
+        '_title_filter_cache', 'query_delay', 'rate_limiter', 'max_points_per_query',
+        'telemetry_window', 'telemetry_batch_size', 'required_channels', 'logger'
+    )
+
+    # Default alarm types for autonomous trucks (can be overridden per instance)
+    DEFAULT_ALARM_TYPES = (
+        "Dump Bed Cannot Be Raised While Vehicle Tilted",
+        "Tilt exceeded with dump bed raised",
+        "Off Path",
+        "Steering Restricted",
+        "Bump Detected: Dump",
+        "Bump Detected: Close",
+        "Undocumented Error c419",
+        "Failed to Drive When Commanded",
+        "Slippery Conditions Caused Vehicle To Stop"
+    )
+
+    # Telemetry channels an alarm can be enriched with, and the MIN/MAX measurement each reads
+    TELEMETRY_CHANNELS = ('gps', 'speed', 'off_path', 'pitch', 'roll')
+    _CHANNEL_MEASUREMENTS = (
+        ('speed', 'Velocity X'),
+        ('off_path', 'Off Path Error'),
+        ('pitch', 'Attitude Pitch'),
+        ('roll', 'Attitude Roll')
+    )
+
+    # influxdb-python sends the query text in the URL even for POST, so each telemetry
+    # request carries at most this many characters of statements
+    _max_query_chars = 6000
+
+    # Title -> alarm type classifications shared by every extractor with the same
+    # ALARM_TYPES, so titles seen in earlier extractions skip classification entirely
+    _shared_title_types: Dict[tuple, Dict[str, Optional[str]]] = {}
+    _shared_title_types_limit = 8  # Distinct alarm type configurations kept
+
+    # Vehicle discovery results shared across extractors: key -> (monotonic time, vehicles)
+    _vehicle_cache: Dict[tuple, tuple] = {}
+    _vehicle_cache_ttl = 60.0  # seconds
+
+    # Telemetry per (server, vehicle, alarm time, window), shared across extractors: repeat
+    # extractions over the same range skip InfluxDB for windows they have already seen
+    _telemetry_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+    _telemetry_cache_limit = 4096  # Windows kept, least recently used evicted first
+    _telemetry_cache_lock = threading.Lock()
     
-    def __init__(self, host: str, port: int = 8086, database: str = "MobiusLog", custom_alarm_types: List[str] = None, query_delay: float = 0.1, max_points_per_query: int = 1000, telemetry_window: float = 0.5):
+    def __init__(self, host: str, port: int = 8086, database: str = "MobiusLog", custom_alarm_types: List[str] = None, query_delay: float = 0.1, max_points_per_query: int = 1000, telemetry_window: float = 0.5, telemetry_batch_size: int = 50, max_workers: int = 4, required_channels: Optional[Dict[str, List[str]]] = None):
         self.host = host
         self.port = port
         self.database = database
         self.client = None
         self.deg_factor = 0.0174444  # Radian to degree conversion
+        self._inv_deg_factor = 1.0 / self.deg_factor  # Multiply instead of divide per value
         self.cancelled = False
+        self._query_wakeups = set()  # One event per in-flight query, set by cancel()
+        self._query_wakeups_lock = threading.Lock()
         self.query_timeout = 10  # Reduced to 10 seconds for better responsiveness
-        self.thread_pool = ThreadPoolExecutor(max_workers=1)  # Single worker for InfluxDB queries
-
-        # Default alarm types for autonomous trucks (can be overridden)
-        self.DEFAULT_ALARM_TYPES = [
-            "Dump Bed Cannot Be Raised While Vehicle Tilted",
-            "Tilt exceeded with dump bed raised",
-            "Off Path",
-            "Steering Restricted",
-            "Bump Detected: Dump",
-            "Bump Detected: Close",
-            "Undocumented Error c419",
-            "Failed to Drive When Commanded",
-            "Slippery Conditions Caused Vehicle To Stop"
-        ]
+        self.max_workers = max(1, max_workers)  # Upper bound on concurrent InfluxDB queries
+        self.thread_pool = ThreadPoolExecutor(max_workers=self.max_workers)
 
         # Use custom alarm types if provided, otherwise use defaults
-        self.ALARM_TYPES = custom_alarm_types if custom_alarm_types is not None else self.DEFAULT_ALARM_TYPES.copy()
+        self.ALARM_TYPES = list(custom_alarm_types) if custom_alarm_types is not None else list(self.DEFAULT_ALARM_TYPES)
+        self._alarm_types_changed()
 
         # Performance optimization settings to protect InfluxDB
         # Configurable rate limiting - adjust based on InfluxDB server capacity
-        self.query_delay = query_delay  # Configurable delay between queries
-        self.max_points_per_query = max_points_per_query  # Limit data points per telemetry query
+        self.query_delay = query_delay  # Back-off step between queries while InfluxDB is slow
+        self.rate_limiter = QueryRateLimiter(base_delay=query_delay)  # Only sleeps while InfluxDB is under stress
+        self.max_points_per_query = max_points_per_query  # Aggregated rows one telemetry request may return
         self.telemetry_window = telemetry_window  # Time window for telemetry data (seconds)
+        self.telemetry_batch_size = telemetry_batch_size  # Alarm events per batched telemetry query
+        # Alarm type -> telemetry channels worth fetching; unlisted alarm types get every channel
+        self.required_channels = {
+            alarm_type: frozenset(channels) & frozenset(self.TELEMETRY_CHANNELS)
+            for alarm_type, channels in (required_channels or {}).items()
+        }
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -55,11 +183,17 @@ class AlarmDataExtractor:
     def connect(self) -> bool:
         """Connect to InfluxDB server with timeout support"""
         try:
-            # Create client with timeout support
-            self.client = InfluxDBClient(
+            # Reuse one keep-alive session per extractor; drop any previous one first
+            if self.client:
+                self.client.close()
+
+            # Create client with timeout support. The HTTP connection pool is sized
+            # to the worker count so concurrent queries reuse TCP connections
+            self.client = FastJSONInfluxDBClient(
                 host=self.host,
                 port=self.port,
-                timeout=self.query_timeout
+                timeout=self.query_timeout,
+                pool_size=self.max_workers
             )
             self.client.switch_database(self.database)
 
@@ -75,61 +209,74 @@ class AlarmDataExtractor:
     def cancel(self):
         """Cancel the current extraction"""
         self.cancelled = True
+        # Wake every query waiter immediately instead of on its next poll
+        with self._query_wakeups_lock:
+            for wake in self._query_wakeups:
+                wake.set()
         self.logger.info("Extraction cancellation requested")
 
     def is_cancelled(self) -> bool:
         """Check if extraction has been cancelled"""
         return self.cancelled
 
-    def _execute_query_with_cancellation(self, query: str, query_name: str = "query"):
+    def _execute_query_with_cancellation(self, query: str, query_name: str = "query", **query_kwargs):
         """
         Execute InfluxDB query with proper cancellation support
         Returns result or raises exception if cancelled
         """
         if self.cancelled:
-            raise Exception(f"Extraction cancelled before {query_name}")
+            raise ExtractionCancelled(f"Extraction cancelled before {query_name}")
 
         def run_query():
-            return self.client.query(query)
+            return self.client.query(query, **query_kwargs)
+
+        # Back off only if recent queries were slow or failed
+        self.rate_limiter.wait()
+        started = time.monotonic()
+
+        # Woken by query completion or cancel(), whichever comes first - no polling
+        wake = threading.Event()
+        with self._query_wakeups_lock:
+            self._query_wakeups.add(wake)
 
         try:
             # Submit query to thread pool with timeout
             future = self.thread_pool.submit(run_query)
+            future.add_done_callback(lambda _: wake.set())
 
-            # Wait for result with timeout, checking cancellation every 2 seconds
-            timeout_interval = 2  # Check every 2 seconds
-            total_timeout = self.query_timeout
-
-            for elapsed in range(0, total_timeout, timeout_interval):
-                if self.cancelled:
-                    future.cancel()
-                    raise Exception(f"Extraction cancelled during {query_name}")
-
-                try:
-                    result = future.result(timeout=timeout_interval)
-                    return result
-                except FutureTimeoutError:
-                    # Continue waiting, will check cancellation in next iteration
-                    continue
-
-            # Final timeout - one last attempt
-            if not self.cancelled:
-                return future.result(timeout=1)
-            else:
+            wake.wait(self.query_timeout)
+
+            if self.cancelled:
+                future.cancel()
+                raise ExtractionCancelled(f"Extraction cancelled during {query_name}")
+            if not future.done():
                 future.cancel()
-                raise Exception(f"Extraction cancelled during {query_name}")
+                raise FutureTimeoutError()
+
+            result = future.result()
+            self.rate_limiter.on_success(time.monotonic() - started)
+            return result
 
         except FutureTimeoutError:
-            raise Exception(f"Query timeout after {total_timeout}s: {query_name}")
+            self.rate_limiter.on_slow()
+            raise Exception(f"Query timeout after {self.query_timeout}s: {query_name}")
+        except InfluxDBServerError:
+            # 5xx from InfluxDB - the server is overloaded
+            self.rate_limiter.on_slow()
+            raise
         except Exception as e:
-            if self.cancelled or "cancelled" in str(e).lower():
-                raise Exception(f"Extraction cancelled during {query_name}")
+            if self.cancelled or isinstance(e, ExtractionCancelled):
+                raise ExtractionCancelled(f"Extraction cancelled during {query_name}")
             raise
+        finally:
+            with self._query_wakeups_lock:
+                self._query_wakeups.discard(wake)
     
     def disconnect(self):
         """Close InfluxDB connection and cleanup thread pool"""
         if self.client:
             self.client.close()
+            self.client = None  # Makes repeated disconnects a no-op
             self.logger.info("InfluxDB connection closed")
 
         # Shutdown thread pool gracefully
@@ -137,23 +284,23 @@ class AlarmDataExtractor:
             self.thread_pool.shutdown(wait=False)  # Don't wait for running queries
             self.logger.info("Thread pool shutdown")
 
-    def _query_with_cancellation(self, query: str, query_name: str = "query"):
+    def _query_with_cancellation(self, query: str, query_name: str = "query", **query_kwargs):
         """Execute InfluxDB query with cancellation support"""
         if self.cancelled:
-            raise Exception(f"Extraction cancelled before {query_name}")
+            raise ExtractionCancelled(f"Extraction cancelled before {query_name}")
 
         try:
             self.logger.debug(f"Executing {query_name}...")
-            result = self._execute_query_with_cancellation(query, query_name)
+            result = self._execute_query_with_cancellation(query, query_name, **query_kwargs)
 
             if self.cancelled:
-                raise Exception(f"Extraction cancelled during {query_name}")
+                raise ExtractionCancelled(f"Extraction cancelled during {query_name}")
 
             return result
 
         except Exception as e:
             if self.cancelled:
-                raise Exception(f"Extraction cancelled during {query_name}")
+                raise ExtractionCancelled(f"Extraction cancelled during {query_name}")
             raise e
     
     def extract_alarm_events(self,
@@ -193,40 +340,80 @@ class AlarmDataExtractor:
 
             self.logger.info(f"Found {len(alarm_events)} alarm events")
 
-            # Step 2: Enrich with telemetry data
-            enriched_events = []
-            for i, event in enumerate(alarm_events):
+            # Step 2: Enrich with telemetry data in adaptively sized, concurrent batches
+            enriched_events = self._enrich_events_in_batches(alarm_events, cancellation_check)
+
+            self.logger.info(f"Successfully extracted {len(enriched_events)} alarm events with telemetry")
+            return enriched_events
+
+        except Exception as e:
+            if self.cancelled or isinstance(e, ExtractionCancelled):
+                self.logger.info("Extraction was cancelled")
+                raise ExtractionCancelled("Extraction cancelled by user")
+            raise e
+    
+    def _enrich_events_in_batches(self, alarm_events: List[Dict[str, Any]], cancellation_check=None) -> List[Dict[str, Any]]:
+        """Attach telemetry to alarm events using up to max_workers concurrent batched queries"""
+        sizer = AdaptiveBatchSizer(maximum=self.telemetry_batch_size)
+        cursor_lock = threading.Lock()
+        cursor = 0
+        stop = threading.Event()
+
+        # Preallocated and filled by index as batches complete, preserving event order
+        enriched_events: List[Optional[Dict[str, Any]]] = [None] * len(alarm_events)
+
+        # Batches walk events grouped by vehicle and time, so each batched query reads a few
+        # contiguous stretches of the same series instead of windows scattered across the fleet.
+        # Events without a vehicle tag sort last rather than failing the comparison
+        def locality(i):
+            vehicle = alarm_events[i]['vehicle']
+            return vehicle is None, vehicle or '', alarm_events[i]['timestamp']
+        order = sorted(range(len(alarm_events)), key=locality)
+
+        def next_batch():
+            """Claim the next slice of events, sized from the latest batch timings"""
+            nonlocal cursor
+            with cursor_lock:
+                start = cursor
+                # Never claim more than a fair share of what is left, so short runs still fan out
+                # across every worker instead of landing in one batch
+                fair_share = -(-(len(alarm_events) - start) // self.max_workers)
+                cursor = min(len(alarm_events), cursor + max(1, min(sizer.size, fair_share)))
+                return start, cursor
+
+        def worker():
+            """Keep pulling batches until the events run out or extraction stops"""
+            while not stop.is_set():
                 # Check for cancellation from both internal state and external callback
                 if self.cancelled or (cancellation_check and cancellation_check()):
-                    self.logger.info("Extraction cancelled by user")
-                    raise Exception("Extraction cancelled by user")
+                    raise ExtractionCancelled("Extraction cancelled by user")
 
-                self.logger.info(f"Processing event {i+1}/{len(alarm_events)}: {event['vehicle']} at {event['timestamp']}")
+                start, end = next_batch()
+                if start >= end:
+                    return
 
-                # Get telemetry for this specific timestamp with cancellation support
-                telemetry = self._get_telemetry_at_timestamp_with_cancellation(
-                    event['vehicle'], event['timestamp'], cancellation_check
-                )
+                indices = order[start:end]
+                batch_started = time.monotonic()
+                telemetry_batch = self._get_telemetry_for_events_with_cancellation([alarm_events[i] for i in indices], cancellation_check)
+                sizer.record(end - start, time.monotonic() - batch_started)
 
                 # Combine alarm info with telemetry
-                enriched_event = {
-                    **event,
-                    **telemetry
-                }
-                enriched_events.append(enriched_event)
+                for i, telemetry in zip(indices, telemetry_batch):
+                    enriched_events[i] = {**alarm_events[i], **telemetry}
+                self.logger.info(f"Processed events {start+1}-{end}/{len(alarm_events)} (next batch size {sizer.size})")
 
-                # Rate limiting to protect InfluxDB
-                time.sleep(self.query_delay)
+        enrich_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            workers = [enrich_pool.submit(worker) for _ in range(self.max_workers)]
+            for future in as_completed(workers):
+                future.result()
+        finally:
+            # Any failure or cancellation stops the remaining workers after their current batch
+            stop.set()
+            enrich_pool.shutdown(wait=False, cancel_futures=True)
 
-            self.logger.info(f"Successfully extracted {len(enriched_events)} alarm events with telemetry")
-            return enriched_events
+        return enriched_events
 
-        except Exception as e:
-            if self.cancelled or "cancelled" in str(e).lower():
-                self.logger.info("Extraction was cancelled")
-                raise Exception("Extraction cancelled by user")
-            raise e
-    
     def _get_alarm_timestamps(self, 
                             start_time: datetime,
                             end_time: datetime,
@@ -234,245 +421,159 @@ class AlarmDataExtractor:
                             selected_vehicles: Optional[List[str]]) -> List[Dict[str, Any]]:
         """Get alarm timestamps from InfluxDB notifications"""
         
-        # Build time filter
-        start_str = start_time.strftime('%Y-%m-%dT%H:%M:%SZ')
-        end_str = end_time.strftime('%Y-%m-%dT%H:%M:%SZ')
+        # Build time filter (integer epoch nanoseconds, no date formatting)
+        start_ns = self._to_epoch_ns(start_time)
+        end_ns = self._to_epoch_ns(end_time)
         
         # Build alarm filter - search for any of the selected alarms in Title
-        alarm_conditions = []
-        for alarm in selected_alarms:
-            if alarm in self.ALARM_TYPES:
-                alarm_conditions.append(f'"Title" =~ /.*{alarm.replace(" ", ".*")}.*/')
-        
-        if not alarm_conditions:
+        alarm_filter = self._build_title_filter(selected_alarms)
+        if not alarm_filter:
             return []
         
-        alarm_filter = " OR ".join(alarm_conditions)
-        
-        # Build vehicle filter
+        # Build vehicle filter; names travel as bind parameters, so no quoting in the query text
         vehicle_filter = ""
-        if selected_vehicles:
-            vehicle_conditions = [f'"Vehicle" = \'{vehicle}\'' for vehicle in selected_vehicles]
+        bind_params = {f'vehicle{n}': vehicle for n, vehicle in enumerate(selected_vehicles or [])}
+        if bind_params:
+            vehicle_conditions = [f'"Vehicle" = ${name}' for name in bind_params]
             vehicle_filter = f' AND ({" OR ".join(vehicle_conditions)})'
         
         # Query for alarm notifications
         query = f'''
         SELECT "Title", "Vehicle", time
         FROM "MobiusLog"."defaultMobiusPolicy"."Notification State"
-        WHERE time >= '{start_str}' AND time < '{end_str}'
+        WHERE time >= {start_ns} AND time < {end_ns}
         AND ({alarm_filter}){vehicle_filter}
         ORDER BY time DESC
         '''
         
         try:
-            result = self._execute_query_with_cancellation(query, "alarm_events_query")
-            points = list(result.get_points())
-            
-            alarm_events = []
-            for point in points:
-                # Determine alarm type from title
-                alarm_type = self._classify_alarm(point.get('Title', ''))
-                if alarm_type:
-                    alarm_events.append({
-                        'alarm_type': alarm_type,
-                        'vehicle': point.get('Vehicle'),
-                        'timestamp': datetime.fromisoformat(point['time'].replace('Z', '+00:00')),
-                        'title': point.get('Title', '')
-                    })
-            
-            return alarm_events
+            result = self._execute_query_with_cancellation(query, "alarm_events_query", epoch='ns', bind_params=bind_params or None)
+            return self._parse_alarm_events(result)
             
         except Exception as e:
             self.logger.error(f"Failed to get alarm timestamps: {e}")
             return []
     
+    def _parse_alarm_events(self, result_set) -> List[Dict[str, Any]]:
+        """Classify a Notification State result (epoch='ns') into alarm events"""
+        raw_series = result_set.raw.get('series') or []
+        rows = [row for series in raw_series for row in series.get('values') or []]
+        if not rows:
+            return []
+
+        # Column-wise processing from the raw rows; no per-point dicts
+        frame = pd.DataFrame(rows, columns=raw_series[0]['columns'])
+        titles = frame['Title'].fillna('')
+
+        # Determine alarm type from title, once per distinct title
+        alarm_types = titles.map({title: self._classify_alarm(title) for title in titles.unique()})
+        keep = alarm_types.notna().to_numpy()
+        timestamps = pd.to_datetime(frame['time'].to_numpy()[keep], unit='ns', utc=True).to_pydatetime()
+
+        return [
+            {
+                'alarm_type': alarm_type,
+                'vehicle': vehicle,
+                'timestamp': timestamp,
+                'title': title
+            }
+            for alarm_type, vehicle, timestamp, title in zip(
+                alarm_types[keep].tolist(),
+                self._share_strings(frame['Vehicle'][keep].tolist()),
+                timestamps,
+                self._share_strings(titles[keep].tolist())
+            )
+        ]
+
+    @staticmethod
+    def _share_strings(values: List[Any]) -> List[Any]:
+        """Collapse equal strings onto one object so repeated vehicles/titles cost a pointer each"""
+        shared: Dict[Any, Any] = {}
+        return [shared.setdefault(value, value) for value in values]
+
+    def _build_title_filter(self, selected_alarms: List[str]) -> Optional[str]:
+        """Build a single alternation regex on Title for the selected alarm types"""
+        cache_key = tuple(selected_alarms)
+        if cache_key in self._title_filter_cache:
+            return self._title_filter_cache[cache_key]
+
+        alternatives = []
+        for alarm in selected_alarms:
+            if alarm in self._alarm_type_set:
+                # Words in order with anything in between; '/' must be escaped inside InfluxQL regex literals
+                pattern = ".*".join(re.escape(word) for word in alarm.split()).replace("/", "\\/")
+                if pattern and pattern not in alternatives:
+                    alternatives.append(pattern)
+
+        title_filter = f'"Title" =~ /{"|".join(alternatives)}/' if alternatives else None
+        self._title_filter_cache[cache_key] = title_filter
+        return title_filter
+
+    def _alarm_types_changed(self):
+        """Rebuild classification and filter lookups after ALARM_TYPES changes"""
+        self._alarm_keywords = [(alarm_type, frozenset(alarm_type.lower().split())) for alarm_type in self.ALARM_TYPES]
+        # Keywords shared between alarm types (dump, bed, vehicle, ...) are scanned once per title
+        self._unique_keywords = frozenset().union(*(keywords for _, keywords in self._alarm_keywords))
+        self._title_to_type = self._shared_title_types_for(tuple(self.ALARM_TYPES))
+        self._alarm_type_set = frozenset(self.ALARM_TYPES)
+        self._title_filter_cache: Dict[tuple, Optional[str]] = {}
+
+    @classmethod
+    def _shared_title_types_for(cls, alarm_types: tuple) -> Dict[str, Optional[str]]:
+        """Classification memo shared across instances configured with alarm_types"""
+        shared = cls._shared_title_types
+        if alarm_types not in shared and len(shared) >= cls._shared_title_types_limit:
+            shared.clear()
+        return shared.setdefault(alarm_types, {})
+
     def _classify_alarm(self, title: str) -> Optional[str]:
         """Classify alarm title into predefined alarm types"""
+        # Titles repeat heavily, so each distinct title is classified only once
+        if title in self._title_to_type:
+            return self._title_to_type[title]
+
+        # Simple keyword matching: find every keyword present, then the first alarm type fully covered
         title_lower = title.lower()
-        
-        for alarm_type in self.ALARM_TYPES:
-            # Simple keyword matching
-            keywords = alarm_type.lower().split()
-            if all(keyword in title_lower for keyword in keywords):
-                return alarm_type
-        
-        return None
+        present = {keyword for keyword in self._unique_keywords if keyword in title_lower}
+        alarm_type = next((candidate for candidate, keywords in self._alarm_keywords if keywords <= present), None)
+
+        self._title_to_type[title] = alarm_type
+        return alarm_type
     
     def _get_telemetry_at_timestamp(self, vehicle: str, timestamp: datetime) -> Dict[str, Any]:
         """Get telemetry data for specific vehicle at specific timestamp"""
-        
-        # Create optimized time window around timestamp
-        start_time = timestamp - timedelta(seconds=self.telemetry_window)
-        end_time = timestamp + timedelta(seconds=self.telemetry_window)
-        start_str = start_time.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-        end_str = end_time.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-        
-        telemetry_data = {
-            'latitude': None,
-            'longitude': None,
-            'speed_kmh': None,           # Maximum absolute speed during alarm event
-            'off_path_error_m': None,   # Maximum absolute off-path deviation during alarm event
-            'steering_command': None,
-            'throttle_command': None,
-            'pitch_deg': None,          # Maximum absolute pitch deviation during alarm event
-            'pitch_min_deg': None,      # Original min pitch for reference
-            'pitch_max_deg': None,      # Original max pitch for reference
-            'roll_deg': None,           # Maximum absolute roll deviation during alarm event
-            'roll_min_deg': None,       # Original min roll for reference
-            'roll_max_deg': None        # Original max roll for reference
-        }
-        
-        # GPS Position
-        try:
-            gps_query = f'''
-            SELECT "Value.Latitude", "Value.Longitude"
-            FROM "MobiusLog"."defaultMobiusPolicy"."PositionGroup.GlobalPosition"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            LIMIT 1
-            '''
-            result = self._execute_query_with_cancellation(gps_query, f"GPS_query_{vehicle}")
-            points = list(result.get_points())
-            if points:
-                telemetry_data['latitude'] = points[0].get('Value.Latitude')
-                telemetry_data['longitude'] = points[0].get('Value.Longitude')
-            
-            time.sleep(self.query_delay)  # Rate limiting
-            
-        except Exception as e:
-            self.logger.warning(f"Failed to get GPS for {vehicle}: {e}")
-        
-        # Speed - Get maximum absolute speed during alarm event
-        try:
-            speed_query = f'''
-            SELECT "Value"
-            FROM "MobiusLog"."defaultMobiusPolicy"."Velocity X"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            ORDER BY time DESC
-            LIMIT {self.max_points_per_query}
-            '''
-            result = self._execute_query_with_cancellation(speed_query, f"speed_query_{vehicle}")
-            points = list(result.get_points())
-            if points:
-                # Get maximum absolute speed (m/s) and convert to km/h
-                speed_values = [abs(p.get('Value', 0)) for p in points if 'Value' in p and p.get('Value') is not None]
-                if speed_values:
-                    max_speed_ms = max(speed_values)
-                    telemetry_data['speed_kmh'] = round(max_speed_ms * 3.6, 2)
-                    self.logger.debug(f"Speed: Found {len(speed_values)} readings, max = {max_speed_ms:.2f} m/s")
-            
-            time.sleep(self.query_delay)
-            
-        except Exception as e:
-            self.logger.warning(f"Failed to get speed for {vehicle}: {e}")
-        
-        # Off Path Error - Get maximum absolute deviation during alarm event
-        try:
-            offpath_query = f'''
-            SELECT "Value"
-            FROM "MobiusLog"."defaultMobiusPolicy"."Off Path Error"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            ORDER BY time DESC
-            LIMIT {self.max_points_per_query}
-            '''
-            result = self._execute_query_with_cancellation(offpath_query, f"offpath_query_{vehicle}")
-            points = list(result.get_points())
-            if points:
-                # Get maximum absolute off-path deviation
-                offpath_values = [abs(p.get('Value', 0)) for p in points if 'Value' in p and p.get('Value') is not None]
-                if offpath_values:
-                    telemetry_data['off_path_error_m'] = round(max(offpath_values), 2)
-                    self.logger.debug(f"Off-path: Found {len(offpath_values)} readings, max = {max(offpath_values):.2f} m")
-            
-            time.sleep(self.query_delay)
-            
-        except Exception as e:
-            self.logger.warning(f"Failed to get off-path error for {vehicle}: {e}")
-        
-        # Pitch and Roll
-        self._get_attitude_data(vehicle, start_str, end_str, telemetry_data)
-        
-        return telemetry_data
-    
-    def _get_attitude_data(self, vehicle: str, start_str: str, end_str: str, telemetry_data: Dict):
-        """Get pitch and roll data with absolute maximum calculation for alarm analysis"""
-        
-        # Pitch - Get maximum absolute pitch during alarm event
-        try:
-            pitch_query = f'''
-            SELECT "Value"
-            FROM "MobiusLog"."defaultMobiusPolicy"."Attitude Pitch"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            ORDER BY time DESC
-            LIMIT {self.max_points_per_query}
-            '''
-            result = self._execute_query_with_cancellation(pitch_query, f"pitch_query_{vehicle}")
-            pitch_points = list(result.get_points())
-            
-            if pitch_points:
-                pitch_values = [p['Value'] / self.deg_factor for p in pitch_points if 'Value' in p and p.get('Value') is not None]
-                if pitch_values:
-                    # Get maximum absolute pitch (most extreme deviation from level)
-                    abs_pitch_values = [abs(pitch) for pitch in pitch_values]
-                    max_abs_pitch = max(abs_pitch_values)
-                    
-                    # Store both the maximum absolute value and the original min/max for context
-                    telemetry_data['pitch_deg'] = round(max_abs_pitch, 2)  # Maximum absolute deviation
-                    telemetry_data['pitch_min_deg'] = round(min(pitch_values), 2)  # Original min for reference
-                    telemetry_data['pitch_max_deg'] = round(max(pitch_values), 2)  # Original max for reference
-                    self.logger.debug(f"Pitch: Found {len(pitch_values)} readings, max absolute = {max_abs_pitch:.2f}°")
-            
-            time.sleep(self.query_delay)
-            
-        except Exception as e:
-            self.logger.warning(f"Failed to get pitch for {vehicle}: {e}")
-        
-        # Roll - Get maximum absolute roll during alarm event
-        try:
-            roll_query = f'''
-            SELECT "Value"
-            FROM "MobiusLog"."defaultMobiusPolicy"."Attitude Roll"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            ORDER BY time DESC
-            LIMIT {self.max_points_per_query}
-            '''
-            result = self._execute_query_with_cancellation(roll_query, f"roll_query_{vehicle}")
-            roll_points = list(result.get_points())
-            
-            if roll_points:
-                roll_values = [r['Value'] / self.deg_factor for r in roll_points if 'Value' in r and r.get('Value') is not None]
-                if roll_values:
-                    # Get maximum absolute roll (most extreme deviation from level)
-                    abs_roll_values = [abs(roll) for roll in roll_values]
-                    max_abs_roll = max(abs_roll_values)
-                    
-                    # Store both the maximum absolute value and the original min/max for context
-                    telemetry_data['roll_deg'] = round(max_abs_roll, 2)  # Maximum absolute deviation
-                    telemetry_data['roll_min_deg'] = round(min(roll_values), 2)  # Original min for reference
-                    telemetry_data['roll_max_deg'] = round(max(roll_values), 2)  # Original max for reference
-                    self.logger.debug(f"Roll: Found {len(roll_values)} readings, max absolute = {max_abs_roll:.2f}°")
-            
-            time.sleep(self.query_delay)
-            
-        except Exception as e:
-            self.logger.warning(f"Failed to get roll for {vehicle}: {e}")
+        return self._get_telemetry_at_timestamp_with_cancellation(vehicle, timestamp)
 
-    def get_available_vehicles(self, start_time: datetime, end_time: datetime) -> List[str]:
-        """Get list of autonomous vehicles active in time range"""
+    def get_available_vehicles(self, start_time: datetime, end_time: datetime, vehicle_pattern: Optional[str] = None) -> List[str]:
+        """Get list of autonomous vehicles active in time range, optionally restricted to a name regex"""
         
-        start_str = start_time.strftime('%Y-%m-%dT%H:%M:%SZ')
-        end_str = end_time.strftime('%Y-%m-%dT%H:%M:%SZ')
+        start_ns = self._to_epoch_ns(start_time)
+        end_ns = self._to_epoch_ns(end_time)
+
+        # Repeated lookups for the same range hit the short-lived shared cache
+        cache_key = (self.host, self.port, self.database, start_ns, end_ns, vehicle_pattern)
+        cached = self._vehicle_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self._vehicle_cache_ttl:
+            return list(cached[1])
         
         try:
-            # Get vehicles from GPS data (autonomous trucks have GPS)
+            # Get vehicles from GPS data (autonomous trucks have GPS); a name pattern
+            # narrows the series InfluxDB has to walk
+            pattern_filter = ""
+            if vehicle_pattern:
+                escaped_pattern = vehicle_pattern.replace("/", "\\/")
+                pattern_filter = f' AND "Vehicle" =~ /{escaped_pattern}/'
             query = f'''
             SHOW TAG VALUES FROM "PositionGroup.GlobalPosition" WITH KEY = "Vehicle"
-            WHERE time >= '{start_str}' AND time < '{end_str}'
+            WHERE time >= {start_ns} AND time < {end_ns}{pattern_filter}
             '''
             result = self._execute_query_with_cancellation(query, "available_vehicles_query")
-            points = list(result.get_points())
-            
-            vehicles = [point['value'] for point in points if point.get('value')]
-            vehicles.sort()
+            vehicles = sorted(point['value'] for point in result.get_points() if point.get('value'))
+
+            now = time.monotonic()
+            for key in [key for key, (stored, _) in self._vehicle_cache.items() if now - stored >= self._vehicle_cache_ttl]:
+                self._vehicle_cache.pop(key, None)
+            self._vehicle_cache[cache_key] = (now, tuple(vehicles))
             
             self.logger.info(f"Found {len(vehicles)} autonomous vehicles in time range")
             return vehicles
@@ -487,7 +588,7 @@ class AlarmDataExtractor:
     
     def get_default_alarm_types(self) -> List[str]:
         """Get default alarm types (factory defaults)"""
-        return self.DEFAULT_ALARM_TYPES.copy()
+        return list(self.DEFAULT_ALARM_TYPES)
     
     def set_alarm_types(self, alarm_types: List[str]) -> bool:
         """Set custom alarm types for analysis"""
@@ -497,7 +598,8 @@ class AlarmDataExtractor:
         
         if not alarm_types:
             self.logger.warning("Empty alarm types list provided, using defaults")
-            self.ALARM_TYPES = self.DEFAULT_ALARM_TYPES.copy()
+            self.ALARM_TYPES = list(self.DEFAULT_ALARM_TYPES)
+            self._alarm_types_changed()
             return True
         
         # Validate alarm types (basic validation)
@@ -510,6 +612,7 @@ class AlarmDataExtractor:
         
         if valid_types:
             self.ALARM_TYPES = valid_types
+            self._alarm_types_changed()
             self.logger.info(f"Updated alarm types: {len(valid_types)} types configured")
             return True
         else:
@@ -528,6 +631,7 @@ class AlarmDataExtractor:
             return False
         
         self.ALARM_TYPES.append(alarm_type)
+        self._alarm_types_changed()
         self.logger.info(f"Added new alarm type: '{alarm_type}'")
         return True
     
@@ -539,6 +643,7 @@ class AlarmDataExtractor:
         
         if alarm_type in self.ALARM_TYPES:
             self.ALARM_TYPES.remove(alarm_type)
+            self._alarm_types_changed()
             self.logger.info(f"Removed alarm type: '{alarm_type}'")
             return True
         else:
@@ -547,7 +652,8 @@ class AlarmDataExtractor:
     
     def reset_to_defaults(self) -> bool:
         """Reset alarm types to factory defaults"""
-        self.ALARM_TYPES = self.DEFAULT_ALARM_TYPES.copy()
+        self.ALARM_TYPES = list(self.DEFAULT_ALARM_TYPES)
+        self._alarm_types_changed()
         self.logger.info("Reset alarm types to factory defaults")
         return True
 
@@ -561,85 +667,63 @@ class AlarmDataExtractor:
 
         # Check for cancellation before starting
         if self.cancelled or (cancellation_check and cancellation_check()):
-            raise Exception("Extraction cancelled before alarm timestamp query")
+            raise ExtractionCancelled("Extraction cancelled before alarm timestamp query")
 
-        # Build time filter
-        start_str = start_time.strftime('%Y-%m-%dT%H:%M:%SZ')
-        end_str = end_time.strftime('%Y-%m-%dT%H:%M:%SZ')
+        # Build time filter (integer epoch nanoseconds, no date formatting)
+        start_ns = self._to_epoch_ns(start_time)
+        end_ns = self._to_epoch_ns(end_time)
 
         # Build alarm filter - search for any of the selected alarms in Title
-        alarm_conditions = []
-        for alarm in selected_alarms:
-            if alarm in self.ALARM_TYPES:
-                alarm_conditions.append(f'"Title" =~ /.*{alarm.replace(" ", ".*")}.*/')
-
-        if not alarm_conditions:
+        alarm_filter = self._build_title_filter(selected_alarms)
+        if not alarm_filter:
             return []
 
-        alarm_filter = " OR ".join(alarm_conditions)
-
-        # Build vehicle filter
+        # Build vehicle filter; names travel as bind parameters, so no quoting in the query text
         vehicle_filter = ""
-        if selected_vehicles:
-            vehicle_conditions = [f'"Vehicle" = \'{vehicle}\'' for vehicle in selected_vehicles]
+        bind_params = {f'vehicle{n}': vehicle for n, vehicle in enumerate(selected_vehicles or [])}
+        if bind_params:
+            vehicle_conditions = [f'"Vehicle" = ${name}' for name in bind_params]
             vehicle_filter = f' AND ({" OR ".join(vehicle_conditions)})'
 
         # Query for alarm notifications
         query = f'''
         SELECT "Title", "Vehicle", time
         FROM "MobiusLog"."defaultMobiusPolicy"."Notification State"
-        WHERE time >= '{start_str}' AND time < '{end_str}'
+        WHERE time >= {start_ns} AND time < {end_ns}
         AND ({alarm_filter}){vehicle_filter}
         ORDER BY time DESC
         '''
 
         try:
             # Use cancellation-aware query method
-            result = self._query_with_cancellation(query, "alarm timestamps query")
-            points = list(result.get_points())
+            result = self._query_with_cancellation(query, "alarm timestamps query", epoch='ns', bind_params=bind_params or None)
 
             # Check for cancellation after query
             if self.cancelled or (cancellation_check and cancellation_check()):
-                raise Exception("Extraction cancelled after alarm timestamp query")
-
-            alarm_events = []
-            for point in points:
-                # Check for cancellation during processing
-                if self.cancelled or (cancellation_check and cancellation_check()):
-                    raise Exception("Extraction cancelled during alarm timestamp processing")
+                raise ExtractionCancelled("Extraction cancelled after alarm timestamp query")
 
-                # Determine alarm type from title
-                alarm_type = self._classify_alarm(point.get('Title', ''))
-                if alarm_type:
-                    alarm_events.append({
-                        'alarm_type': alarm_type,
-                        'vehicle': point.get('Vehicle'),
-                        'timestamp': datetime.fromisoformat(point['time'].replace('Z', '+00:00')),
-                        'title': point.get('Title', '')
-                    })
-
-            return alarm_events
+            return self._parse_alarm_events(result)
 
         except Exception as e:
-            if self.cancelled or "cancelled" in str(e).lower():
-                raise Exception("Extraction cancelled during alarm timestamp retrieval")
+            if self.cancelled or isinstance(e, ExtractionCancelled):
+                raise ExtractionCancelled("Extraction cancelled during alarm timestamp retrieval")
             self.logger.error(f"Failed to get alarm timestamps: {e}")
             return []
 
     def _get_telemetry_at_timestamp_with_cancellation(self, vehicle: str, timestamp: datetime, cancellation_check=None) -> Dict[str, Any]:
         """Get telemetry data for specific vehicle at specific timestamp with cancellation support"""
-
-        # Check for cancellation before starting
-        if self.cancelled or (cancellation_check and cancellation_check()):
-            raise Exception("Extraction cancelled before telemetry query")
-
-        # Create optimized time window around timestamp
-        start_time = timestamp - timedelta(seconds=self.telemetry_window)
-        end_time = timestamp + timedelta(seconds=self.telemetry_window)
-        start_str = start_time.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-        end_str = end_time.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-
-        telemetry_data = {
+        event = {'vehicle': vehicle, 'timestamp': timestamp}
+        return self._get_telemetry_for_events_with_cancellation([event], cancellation_check)[0]
+
+    @staticmethod
+    def _to_epoch_ns(value: datetime) -> int:
+        """Convert a datetime to epoch nanoseconds for InfluxQL time literals; naive values are UTC"""
+        return pd.Timestamp(value).value
+
+    @staticmethod
+    def _empty_telemetry() -> Dict[str, Any]:
+        """Telemetry record with every channel unset"""
+        return {
             'latitude': None,
             'longitude': None,
             'speed_kmh': None,
@@ -654,150 +738,169 @@ class AlarmDataExtractor:
             'roll_max_deg': None
         }
 
-        # GPS Position with cancellation
-        try:
-            if self.cancelled or (cancellation_check and cancellation_check()):
-                raise Exception("Extraction cancelled before GPS query")
-
-            gps_query = f'''
-            SELECT "Value.Latitude", "Value.Longitude"
-            FROM "MobiusLog"."defaultMobiusPolicy"."PositionGroup.GlobalPosition"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            LIMIT 1
-            '''
-            result = self._query_with_cancellation(gps_query, f"GPS query for {vehicle}")
-            points = list(result.get_points())
-
-            if points:
-                telemetry_data['latitude'] = points[0].get('Value.Latitude')
-                telemetry_data['longitude'] = points[0].get('Value.Longitude')
-
-            time.sleep(self.query_delay)  # Rate limiting
-
-        except Exception as e:
-            if self.cancelled or "cancelled" in str(e).lower():
-                raise Exception("Extraction cancelled during GPS telemetry query")
-            self.logger.warning(f"Failed to get GPS for {vehicle}: {e}")
-
-        # Speed with cancellation
-        try:
-            if self.cancelled or (cancellation_check and cancellation_check()):
-                raise Exception("Extraction cancelled before speed query")
-
-            speed_query = f'''
-            SELECT "Value"
-            FROM "MobiusLog"."defaultMobiusPolicy"."Velocity X"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            '''
-            result = self._query_with_cancellation(speed_query, f"speed query for {vehicle}")
-            points = list(result.get_points())
-
-            if points:
-                # Get maximum absolute speed during alarm event
-                speed_values = [abs(float(point.get('Value', 0))) for point in points if point.get('Value') is not None]
-                if speed_values:
-                    telemetry_data['speed_kmh'] = max(speed_values) * 3.6  # Convert m/s to km/h
-
-            time.sleep(self.query_delay)
-
-        except Exception as e:
-            if self.cancelled or "cancelled" in str(e).lower():
-                raise Exception("Extraction cancelled during speed telemetry query")
-            self.logger.warning(f"Failed to get speed for {vehicle}: {e}")
-
-        # Off Path Error with cancellation
-        try:
-            if self.cancelled or (cancellation_check and cancellation_check()):
-                raise Exception("Extraction cancelled before off-path query")
-
-            offpath_query = f'''
-            SELECT "Value"
-            FROM "MobiusLog"."defaultMobiusPolicy"."Off Path Error"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            ORDER BY time DESC
-            LIMIT {self.max_points_per_query}
-            '''
-            result = self._query_with_cancellation(offpath_query, f"off-path query for {vehicle}")
-            points = list(result.get_points())
+    @staticmethod
+    def _reduce_signed(result_set, scale: float = 1.0, measurement: Optional[str] = None) -> Optional[tuple]:
+        """(min, max, max_abs) of a channel from its MIN/MAX aggregate row, None if the window was empty"""
+        # Read the raw [time, vmin, vmax] rows directly; no per-point dicts
+        for series in result_set.raw.get('series') or []:
+            if measurement is not None and series.get('name') != measurement:
+                continue
+            columns = series['columns']
+            min_col, max_col = columns.index('vmin'), columns.index('vmax')
+            for row in series.get('values') or []:
+                if row[min_col] is not None and row[max_col] is not None:
+                    vmin, vmax = float(row[min_col]) * scale, float(row[max_col]) * scale
+                    return vmin, vmax, max(-vmin, vmax)
+        return None
 
-            if points:
-                # Get maximum absolute off-path deviation
-                offpath_values = [abs(p.get('Value', 0)) for p in points if 'Value' in p and p.get('Value') is not None]
-                if offpath_values:
-                    telemetry_data['off_path_error_m'] = round(max(offpath_values), 2)
-                    self.logger.debug(f"Off-path: Found {len(offpath_values)} readings, max = {max(offpath_values):.2f} m")
+    @classmethod
+    def _remember_telemetry(cls, key: tuple, telemetry_data: Dict[str, Any]):
+        """Store a window's telemetry in the shared LRU cache"""
+        with cls._telemetry_cache_lock:
+            cls._telemetry_cache[key] = dict(telemetry_data)
+            cls._telemetry_cache.move_to_end(key)
+            while len(cls._telemetry_cache) > cls._telemetry_cache_limit:
+                cls._telemetry_cache.popitem(last=False)
 
-            time.sleep(self.query_delay)
+    @classmethod
+    def clear_telemetry_cache(cls):
+        """Forget every cached telemetry window"""
+        with cls._telemetry_cache_lock:
+            cls._telemetry_cache.clear()
 
-        except Exception as e:
-            if self.cancelled or "cancelled" in str(e).lower():
-                raise Exception("Extraction cancelled during off-path telemetry query")
-            self.logger.warning(f"Failed to get off-path error for {vehicle}: {e}")
+    def _get_telemetry_for_events_with_cancellation(self, events: List[Dict[str, Any]], cancellation_check=None) -> List[Dict[str, Any]]:
+        """Get telemetry for a batch of alarm events with server-side aggregation"""
 
-        # Pitch data with cancellation
-        try:
-            if self.cancelled or (cancellation_check and cancellation_check()):
-                raise Exception("Extraction cancelled before pitch query")
-
-            pitch_query = f'''
-            SELECT "Value"
-            FROM "MobiusLog"."defaultMobiusPolicy"."Attitude Pitch"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            ORDER BY time DESC
-            LIMIT {self.max_points_per_query}
-            '''
-            result = self._query_with_cancellation(pitch_query, f"pitch query for {vehicle}")
-            pitch_points = list(result.get_points())
-
-            if pitch_points:
-                pitch_values = [p['Value'] / self.deg_factor for p in pitch_points if 'Value' in p and p.get('Value') is not None]
-                if pitch_values:
-                    # Get maximum absolute pitch (most extreme deviation from level)
-                    abs_pitch_values = [abs(pitch) for pitch in pitch_values]
-                    max_abs_pitch = max(abs_pitch_values)
-                    telemetry_data['pitch_deg'] = round(max_abs_pitch, 2)
-                    telemetry_data['pitch_min_deg'] = round(min(pitch_values), 2)
-                    telemetry_data['pitch_max_deg'] = round(max(pitch_values), 2)
-                    self.logger.debug(f"Pitch: Found {len(pitch_values)} readings, max absolute = {max_abs_pitch:.2f}°")
-
-            time.sleep(self.query_delay)
-
-        except Exception as e:
-            if self.cancelled or "cancelled" in str(e).lower():
-                raise Exception("Extraction cancelled during pitch telemetry query")
-            self.logger.warning(f"Failed to get pitch for {vehicle}: {e}")
+        # Check for cancellation before starting
+        if self.cancelled or (cancellation_check and cancellation_check()):
+            raise ExtractionCancelled("Extraction cancelled before telemetry query")
+
+        telemetry_batch = [self._empty_telemetry() for _ in events]
+        if not events:
+            return telemetry_batch
+
+        # Event times and +/- telemetry window as epoch nanoseconds
+        window_ns = int(round(self.telemetry_window * 1e9))
+        event_ns = pd.to_datetime([event['timestamp'] for event in events], utc=True).asi8.tolist()
+
+        # Identical windows (same vehicle, alarm time and channels) reuse earlier results, both
+        # from previous batches and from duplicates inside this one
+        all_channels = frozenset(self.TELEMETRY_CHANNELS)
+        pending: Dict[tuple, List[int]] = {}
+        with self._telemetry_cache_lock:
+            for i, (event, ts) in enumerate(zip(events, event_ns)):
+                channels = self.required_channels.get(event.get('alarm_type'), all_channels)
+                key = (self.host, self.port, self.database, event['vehicle'], ts, window_ns, channels)
+                cached = self._telemetry_cache.get(key)
+                if cached is not None:
+                    self._telemetry_cache.move_to_end(key)
+                    telemetry_batch[i] = dict(cached)
+                else:
+                    pending.setdefault(key, []).append(i)
+        if not pending:
+            return telemetry_batch
+
+        # Up to two statements per window, all windows in one round trip. InfluxDB reduces each
+        # window to a single selector/MIN/MAX row instead of shipping every raw point back.
+        # Channels the alarm type does not need are never queried
+        source = '"MobiusLog"."defaultMobiusPolicy"'
+        statements = []
+        statement_rows = []  # Most rows each statement can return: one per series
+        statement_slots = []  # Per window: (GPS statement index, MIN/MAX statement index), None if skipped
+        vehicle_params: Dict[str, str] = {}  # vehicle -> bind parameter name, one per distinct vehicle
+        for _, _, _, vehicle, ts, _, channels in pending:
+            param = vehicle_params.setdefault(vehicle, f'vehicle{len(vehicle_params)}')
+            where = f'"Vehicle" = ${param} AND time >= {ts - window_ns} AND time < {ts + window_ns}'
+            gps_slot = channels_slot = None
+            if 'gps' in channels:
+                gps_slot = len(statements)
+                statements.append(f'SELECT FIRST("Value.Latitude") AS lat, FIRST("Value.Longitude") AS lon FROM {source}."PositionGroup.GlobalPosition" WHERE {where}')
+                statement_rows.append(1)
+            measurements = [measurement for name, measurement in self._CHANNEL_MEASUREMENTS if name in channels]
+            if measurements:
+                # Speed, off-path, pitch and roll in one statement: a regex FROM returns one
+                # MIN/MAX series per measurement
+                channels_slot = len(statements)
+                statements.append(f'SELECT MIN("Value") AS vmin, MAX("Value") AS vmax FROM {source}./^({"|".join(measurements)})$/ WHERE {where}')
+                statement_rows.append(len(measurements))
+            statement_slots.append((gps_slot, channels_slot))
+        if not statements:
+            return telemetry_batch
 
-        # Roll data with cancellation
         try:
             if self.cancelled or (cancellation_check and cancellation_check()):
-                raise Exception("Extraction cancelled before roll query")
-
-            roll_query = f'''
-            SELECT "Value"
-            FROM "MobiusLog"."defaultMobiusPolicy"."Attitude Roll"
-            WHERE time >= '{start_str}' AND time < '{end_str}' AND "Vehicle" = '{vehicle}'
-            ORDER BY time DESC
-            LIMIT {self.max_points_per_query}
-            '''
-            result = self._query_with_cancellation(roll_query, f"roll query for {vehicle}")
-            roll_points = list(result.get_points())
-
-            if roll_points:
-                roll_values = [p['Value'] / self.deg_factor for p in roll_points if 'Value' in p and p.get('Value') is not None]
-                if roll_values:
-                    # Get maximum absolute roll (most extreme deviation from level)
-                    abs_roll_values = [abs(roll) for roll in roll_values]
-                    max_abs_roll = max(abs_roll_values)
-                    telemetry_data['roll_deg'] = round(max_abs_roll, 2)
-                    telemetry_data['roll_min_deg'] = round(min(roll_values), 2)
-                    telemetry_data['roll_max_deg'] = round(max(roll_values), 2)
-                    self.logger.debug(f"Roll: Found {len(roll_values)} readings, max absolute = {max_abs_roll:.2f}°")
-
-            time.sleep(self.query_delay)
+                raise ExtractionCancelled("Extraction cancelled before telemetry query")
+
+            # Statements are split into requests of bounded length and at most
+            # max_points_per_query result rows; each returns one ResultSet per statement, in
+            # statement order. A failing statement only blanks its own channel instead of the
+            # whole batch
+            bind_params = {param: vehicle for vehicle, param in vehicle_params.items()}
+            requests = [[]]
+            request_chars = request_rows = 0
+            for statement, rows in zip(statements, statement_rows):
+                if requests[-1] and (request_chars + len(statement) > self._max_query_chars
+                                     or request_rows + rows > self.max_points_per_query):
+                    requests.append([])
+                    request_chars = request_rows = 0
+                requests[-1].append(statement)
+                request_chars += len(statement) + 1
+                request_rows += rows
+
+            results = []
+            for request in requests:
+                request_results = self._query_with_cancellation(
+                    ";".join(request), f"telemetry query for {len(request)} statements",
+                    raise_errors=False, bind_params=bind_params
+                )
+                if not isinstance(request_results, list):
+                    request_results = [request_results]  # A single statement comes back unwrapped
+                results.extend(request_results)
+            failed = [result_set.error for result_set in results if result_set.error]
+            if failed:
+                self.logger.warning(f"{len(failed)}/{len(results)} telemetry statements failed: {failed[0]}")
+
+            skipped = ResultSet({})
+            for (key, indices), slots in zip(pending.items(), statement_slots):
+                gps_rs, channels_rs = (results[slot] if slot is not None else skipped for slot in slots)
+                telemetry_data = telemetry_batch[indices[0]]
+
+                # GPS Position - first fix in the window
+                fix = next(gps_rs.get_points(), None)
+                if fix:
+                    telemetry_data['latitude'] = fix.get('lat')
+                    telemetry_data['longitude'] = fix.get('lon')
+
+                # Speed - maximum absolute speed during alarm event
+                speed = self._reduce_signed(channels_rs, measurement='Velocity X')
+                if speed:
+                    telemetry_data['speed_kmh'] = speed[2] * 3.6  # Convert m/s to km/h
+
+                # Off Path Error - maximum absolute off-path deviation
+                offpath = self._reduce_signed(channels_rs, measurement='Off Path Error')
+                if offpath:
+                    telemetry_data['off_path_error_m'] = round(offpath[2], 2)
+
+                # Pitch / Roll - maximum absolute angle (most extreme deviation from level)
+                for name, measurement in (('pitch', 'Attitude Pitch'), ('roll', 'Attitude Roll')):
+                    angle = self._reduce_signed(channels_rs, self._inv_deg_factor, measurement)
+                    if angle:
+                        telemetry_data[f'{name}_min_deg'] = round(angle[0], 2)
+                        telemetry_data[f'{name}_max_deg'] = round(angle[1], 2)
+                        telemetry_data[f'{name}_deg'] = round(angle[2], 2)
+
+                for index in indices[1:]:
+                    telemetry_batch[index] = dict(telemetry_data)
+
+                # Only windows whose every statement succeeded with data are remembered; failed
+                # or empty ones (e.g. data not written yet) are queried again next time
+                if all(not results[slot].error and results[slot].raw.get('series')
+                       for slot in slots if slot is not None):
+                    self._remember_telemetry(key, telemetry_data)
 
         except Exception as e:
-            if self.cancelled or "cancelled" in str(e).lower():
-                raise Exception("Extraction cancelled during roll telemetry query")
-            self.logger.warning(f"Failed to get roll for {vehicle}: {e}")
+            if self.cancelled or isinstance(e, ExtractionCancelled):
+                raise ExtractionCancelled("Extraction cancelled during telemetry query")
+            self.logger.warning(f"Failed to get telemetry for {len(events)} events: {e}")
 
-        return telemetry_data
\ No newline at end of file
+        return telemetry_batch
@@ -21,7 +21,7 @@ a = Analysis(['main.py'],
              hookspath=[], 
              hooksconfig={}, 
              runtime_hooks=[], 
-             excludes=[], 
+             excludes=['tkinter', 'matplotlib', 'scipy', 'IPython', 'PIL.ImageQt', 'numpy.tests', 'pandas.tests'], 
              win_no_prefer_redirects=False, 
              win_private_assemblies=False, 
              cipher=None, 
@@ -36,8 +36,7 @@ exe = EXE(pyz,
           debug=False, 
           bootloader_ignore_signals=False, 
           strip=False, 
-          upx=True, 
-          upx_exclude=[], 
+          upx=False, 
           console=True, 
           disable_windowed_traceback=False, 
           target_arch=None, 
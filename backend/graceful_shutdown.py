@@ -36,6 +36,7 @@ class GracefulShutdown:
         self.shutdown_timeout_seconds = 30
         self._signal_handlers_registered = False
         self._shutdown_in_progress = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
     async def setup(self):
         """Setup signal handlers for graceful shutdown"""
@@ -44,22 +45,16 @@ class GracefulShutdown:
             return
             
         try:
-            # Register signal handlers for graceful shutdown
-            loop = asyncio.get_event_loop()
+            # Register signal handlers for graceful shutdown on the loop running setup()
+            self._loop = asyncio.get_running_loop()
             
             # Handle SIGTERM (typical Docker/systemd shutdown signal)
             if hasattr(signal, 'SIGTERM'):
-                loop.add_signal_handler(
-                    signal.SIGTERM, 
-                    lambda: asyncio.create_task(self._signal_handler('SIGTERM'))
-                )
+                self._loop.add_signal_handler(signal.SIGTERM, self._on_signal, 'SIGTERM')
             
             # Handle SIGINT (Ctrl+C)
             if hasattr(signal, 'SIGINT'):
-                loop.add_signal_handler(
-                    signal.SIGINT, 
-                    lambda: asyncio.create_task(self._signal_handler('SIGINT'))
-                )
+                self._loop.add_signal_handler(signal.SIGINT, self._on_signal, 'SIGINT')
             
             self._signal_handlers_registered = True
             logger.info("Graceful shutdown signal handlers registered")
@@ -68,6 +63,13 @@ class GracefulShutdown:
             logger.error(f"Failed to setup signal handlers: {e}")
             # Don't fail startup if signal handlers can't be registered
     
+    def _on_signal(self, signal_name: str):
+        """Signal callback run by the event loop; starts at most one shutdown task"""
+        if self._shutdown_in_progress:
+            logger.warning(f"Received {signal_name} during shutdown - forcing immediate exit")
+            sys.exit(1)
+        asyncio.ensure_future(self._signal_handler(signal_name), loop=self._loop)
+    
     async def _signal_handler(self, signal_name: str):
         """Handle shutdown signals"""
         if self._shutdown_in_progress:
@@ -151,7 +153,7 @@ class GracefulShutdown:
                         else:
                             # Mark job as cancelled directly
                             job.status = 'cancelled'
-                            job.completed_at = datetime.utcnow()
+                            job.completed_at = datetime.now(timezone.utc)
                             
                         cancelled_count += 1
                         
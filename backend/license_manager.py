@@ -3,28 +3,88 @@ License Management System for AHS Alarm Analysis
 Simple MAC address-based license validation with embedded license database
 """
 
+import csv
+import functools
+import io
 import json
 import re
 import hashlib
 import platform
 import subprocess
-from datetime import datetime
-from typing import List, Dict, Optional, Any
+import threading
+import time
+from datetime import date, datetime
+from typing import List, Dict, Optional, Any, Tuple, FrozenSet
 from pathlib import Path
 import logging
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps_pretty(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+except ImportError:  # orjson is optional; fall back to stdlib json
+    _json_loads = json.loads
+
+    def _json_dumps_pretty(obj) -> bytes:
+        return (json.dumps(obj, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+try:
+    import psutil
+except ImportError:  # Without psutil, Windows falls back to the getmac command
+    psutil = None
+
+# License key format, compiled once: AHS-<year>-<user>-MAC<6 hex>-EXP<yymmdd>-CHK<hex>
+_LICENSE_RE = re.compile(r'^AHS-(\d{4})-([A-Z0-9]+)-MAC([A-F0-9]{6})-EXP(\d{6})-CHK([A-F0-9]+)$')
+_MAC_CLEAN_RE = re.compile(r'[^A-F0-9]')
+_USER_CLEAN_RE = re.compile(r'[^A-Z0-9]')
+_LICENSE_MIN_LENGTH = len('AHS-0000-U-MAC000000-EXP000000-CHK0')  # Shortest key the regex accepts
+_MAC_STRIP_TABLE = str.maketrans('', '', '-:')  # Separators dropped from displayed MAC addresses
+_HEX_DIGITS = b'0123456789ABCDEFabcdef'
+_INVALID_MACS = frozenset({'FFFFFFFFFFFF', '000000000000'})  # Broadcast and unset addresses
+
+@functools.lru_cache(maxsize=1024)
+def _expiry_date(expiry: str) -> date:
+    """Parse a zero-padded YYYY-MM-DD expiry once per distinct string"""
+    return date.fromisoformat(expiry)
+
 class LicenseManager:
     """Simple MAC address-based license manager"""
 
+    MAC_CACHE_TTL = 60.0  # Seconds between machine MAC address lookups
+
+    # Parse result for every admin master key. Shared and treated as read-only
+    _ADMIN_PARSED = {
+        'product': 'ADMIN',
+        'year': '2025',
+        'user': 'MASTER',
+        'mac': 'ANY',
+        'expiry': '2099-12-31',
+        'checksum': 'OVERRIDE',
+        'is_admin': True
+    }
+
     def __init__(self, license_file: str = "licenses.json"):
         self.license_file = Path(__file__).parent / license_file
         self.logger = logging.getLogger(__name__)
 
         # Admin master keys that work on any machine
-        self.ADMIN_MASTER_KEYS = [
+        self.ADMIN_MASTER_KEYS = frozenset({
             "ADMIN-2025-MASTER-ANYMAC-EXP209912-OVERRIDE",
             "ADMIN-2025-BACKUP-ANYMAC-EXP209912-OVERRIDE"
-        ]
+        })
+
+        # (monotonic time, MACs, MAC prefixes) from the last lookup, and validation
+        # results for database keys per (key, day, MAC prefixes)
+        self._mac_cache: Optional[Tuple[float, List[str], FrozenSet[str]]] = None
+        self._mac_cache_lock = threading.Lock()
+        self._validation_cache: Dict[Tuple[str, str, FrozenSet[str]], Dict[str, Any]] = {}
+
+        # Stored keys parsed once, with their expiry as a date
+        self._parsed: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._expiry_dates: Dict[str, date] = {}
 
         self._load_licenses()
 
@@ -32,9 +92,8 @@ class LicenseManager:
         """Load license database from file"""
         try:
             if self.license_file.exists():
-                with open(self.license_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.licenses = data.get('licenses', {})
+                data = _json_loads(self.license_file.read_bytes())
+                self.licenses = data.get('licenses', {})
             else:
                 self.licenses = {}
                 self._create_default_license_file()
@@ -42,6 +101,17 @@ class LicenseManager:
             self.logger.error(f"Error loading licenses: {e}")
             self.licenses = {}
 
+        self._parsed.clear()
+        self._expiry_dates.clear()
+        for license_key in self.licenses:
+            self._index_license(license_key)
+
+    def _index_license(self, license_key: str):
+        """Parse a stored key once so validation skips the regex and date parsing"""
+        parsed = self._parsed[license_key] = self.parse_license_key(license_key)
+        if parsed:
+            self._expiry_dates[license_key] = _expiry_date(parsed['expiry'])
+
     def _create_default_license_file(self):
         """Create default license file with admin keys"""
         default_data = {
@@ -61,31 +131,56 @@ class LicenseManager:
         }
 
         try:
-            with open(self.license_file, 'w', encoding='utf-8') as f:
-                json.dump(default_data, f, indent=2)
+            self.license_file.write_bytes(_json_dumps_pretty(default_data))
             self.licenses = default_data['licenses']
         except Exception as e:
             self.logger.error(f"Error creating default license file: {e}")
 
     def get_machine_mac_addresses(self) -> List[str]:
-        """Get all MAC addresses from the current machine"""
+        """Get all MAC addresses from the current machine, looked up at most once per MAC_CACHE_TTL"""
+        with self._mac_cache_lock:
+            now = time.monotonic()
+            if self._mac_cache is not None and now - self._mac_cache[0] < self.MAC_CACHE_TTL:
+                return list(self._mac_cache[1])
+
+            mac_addresses = self._read_machine_mac_addresses()
+            if self._mac_cache is not None and self._mac_cache[1] != mac_addresses:
+                self._validation_cache.clear()  # Hardware changed; drop results keyed on the old MACs
+            self._mac_cache = (now, mac_addresses, frozenset(mac[:6] for mac in mac_addresses))
+            return list(mac_addresses)
+
+    def _current_mac_prefixes(self) -> FrozenSet[str]:
+        """First six hex digits of every current MAC, cached with the MAC list"""
+        self.get_machine_mac_addresses()  # Refreshes the cache once it is stale
+        return self._mac_cache[2]
+
+    def _read_machine_mac_addresses(self) -> List[str]:
+        """Query the operating system for the machine's MAC addresses"""
         mac_addresses = []
 
         try:
-            if platform.system().lower() == 'windows':
+            if platform.system().lower() == 'windows' and psutil is not None:
+                # Read adapter addresses in-process instead of spawning getmac
+                for addresses in psutil.net_if_addrs().values():
+                    for address in addresses:
+                        if address.family == psutil.AF_LINK:
+                            mac = address.address.translate(_MAC_STRIP_TABLE).upper()
+                            if self._is_valid_mac(mac) and mac not in mac_addresses:
+                                mac_addresses.append(mac)
+            elif platform.system().lower() == 'windows':
                 # Use getmac command for Windows
                 result = subprocess.run(['getmac', '/v', '/fo', 'csv'],
                                       capture_output=True, text=True, check=True)
 
-                lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                for line in lines:
-                    if line.strip():
-                        # Parse CSV format: "Connection Name","Network Adapter","Physical Address","Transport Name"
-                        parts = [part.strip('"') for part in line.split(',')]
-                        if len(parts) >= 3 and parts[2] != 'N/A':
-                            mac = parts[2].replace('-', '').upper()
-                            if self._is_valid_mac(mac) and mac not in mac_addresses:
-                                mac_addresses.append(mac)
+                # Parse CSV format: "Connection Name","Network Adapter","Physical Address","Transport Name"
+                # csv.reader copes with quoted commas in adapter names
+                reader = csv.reader(io.StringIO(result.stdout))
+                next(reader, None)  # Skip header
+                for row in reader:
+                    if len(row) >= 3 and row[2] != 'N/A':
+                        mac = row[2].translate(_MAC_STRIP_TABLE).upper()
+                        if self._is_valid_mac(mac) and mac not in mac_addresses:
+                            mac_addresses.append(mac)
             else:
                 # Linux/Mac fallback
                 import uuid
@@ -106,23 +201,22 @@ class LicenseManager:
             except:
                 pass
 
+        # Sorted so the primary (first) MAC doesn't depend on the source's adapter order
+        mac_addresses.sort()
         self.logger.info(f"Found MAC addresses: {mac_addresses}")
         return mac_addresses
 
     def _is_valid_mac(self, mac: str) -> bool:
         """Validate MAC address format"""
-        if not mac or len(mac) != 12:
+        if not mac or len(mac) != 12 or not mac.isascii():
             return False
 
-        # Check if all characters are hex
-        try:
-            int(mac, 16)
-        except ValueError:
+        # Check if all characters are hex: deleting every hex digit must leave nothing
+        if mac.encode('ascii').translate(None, _HEX_DIGITS):
             return False
 
         # Ignore broadcast, multicast, and invalid MACs
-        invalid_macs = ['FFFFFFFFFFFF', '000000000000']
-        return mac not in invalid_macs
+        return mac not in _INVALID_MACS
 
     def parse_license_key(self, license_key: str) -> Optional[Dict[str, str]]:
         """Parse license key format: AHS-2025-USER-MACAABBCC-EXP251231-CHK789"""
@@ -131,19 +225,13 @@ class LicenseManager:
 
         # Check for admin master keys first
         if license_key in self.ADMIN_MASTER_KEYS:
-            return {
-                'product': 'ADMIN',
-                'year': '2025',
-                'user': 'MASTER',
-                'mac': 'ANY',
-                'expiry': '2099-12-31',
-                'checksum': 'OVERRIDE',
-                'is_admin': True
-            }
+            return self._ADMIN_PARSED
 
-        # Parse regular license key format
-        pattern = r'^AHS-(\d{4})-([A-Z0-9]+)-MAC([A-F0-9]{6})-EXP(\d{6})-CHK([A-F0-9]+)$'
-        match = re.match(pattern, license_key.upper())
+        # Parse regular license key format; obvious non-keys are rejected before the regex runs
+        key = license_key.upper()
+        if len(key) < _LICENSE_MIN_LENGTH or not key.startswith('AHS-'):
+            return None
+        match = _LICENSE_RE.match(key)
 
         if not match:
             return None
@@ -153,7 +241,7 @@ class LicenseManager:
         # Convert expiry string to date format
         try:
             expiry_date = f"20{expiry_str[:2]}-{expiry_str[2:4]}-{expiry_str[4:6]}"
-            datetime.strptime(expiry_date, '%Y-%m-%d')  # Validate date format
+            _expiry_date(expiry_date)  # Validate date format
         except ValueError:
             return None
 
@@ -169,6 +257,21 @@ class LicenseManager:
 
     def validate_license(self, license_key: str) -> Dict[str, Any]:
         """Validate license key against current machine and expiry"""
+        # Results only change with the day (expiry), the machine's MACs or the database
+        today = date.today()
+        mac_prefixes = self._current_mac_prefixes()
+        if license_key not in self.licenses:
+            # Only database keys are cached, so arbitrary client input can't grow the cache
+            return self._validate_license_uncached(license_key, today, mac_prefixes)
+
+        cache_key = (license_key, today.isoformat(), mac_prefixes)
+        cached = self._validation_cache.get(cache_key)
+        if cached is None:
+            cached = self._validation_cache[cache_key] = self._validate_license_uncached(license_key, today, mac_prefixes)
+        return dict(cached)
+
+    def _validate_license_uncached(self, license_key: str, today, mac_prefixes: FrozenSet[str]) -> Dict[str, Any]:
+        """Validate license key against the given MAC prefixes and expiry as of today"""
         result = {
             'valid': False,
             'reason': 'Invalid license key',
@@ -177,8 +280,8 @@ class LicenseManager:
             'mac_bound': None
         }
 
-        # Parse license key
-        parsed = self.parse_license_key(license_key)
+        # Parse license key (stored keys were parsed at load time)
+        parsed = self._parsed[license_key] if license_key in self._parsed else self.parse_license_key(license_key)
         if not parsed:
             result['reason'] = 'Invalid license key format'
             return result
@@ -203,8 +306,8 @@ class LicenseManager:
 
         # Check expiry date
         try:
-            expiry_date = datetime.strptime(parsed['expiry'], '%Y-%m-%d')
-            if expiry_date.date() < datetime.now().date():
+            expiry_date = self._expiry_dates.get(license_key) or _expiry_date(parsed['expiry'])
+            if expiry_date < today:
                 result['reason'] = f"License expired on {parsed['expiry']}"
                 return result
         except ValueError:
@@ -212,17 +315,10 @@ class LicenseManager:
             return result
 
         # Check MAC address binding
-        current_macs = self.get_machine_mac_addresses()
         license_mac = parsed['mac']
 
         # Check if license MAC matches any current MAC (partial match - first 6 chars)
-        mac_match = False
-        for current_mac in current_macs:
-            if current_mac[:6] == license_mac or current_mac == license_mac + '000000':
-                mac_match = True
-                break
-
-        if not mac_match:
+        if license_mac not in mac_prefixes:
             result['reason'] = f"License bound to different hardware (MAC: {license_mac})"
             result['mac_bound'] = license_mac
             return result
@@ -242,7 +338,7 @@ class LicenseManager:
     def generate_license_key(self, name: str, mac_address: str, expiry_date: str, user_id: str = None) -> str:
         """Generate a license key for given parameters"""
         # Clean MAC address
-        mac_clean = re.sub(r'[^A-F0-9]', '', mac_address.upper())
+        mac_clean = _MAC_CLEAN_RE.sub('', mac_address.upper())
         if len(mac_clean) >= 6:
             mac_short = mac_clean[:6]
         else:
@@ -250,7 +346,7 @@ class LicenseManager:
 
         # Generate user ID if not provided
         if not user_id:
-            user_id = re.sub(r'[^A-Z0-9]', '', name.upper())[:6]
+            user_id = _USER_CLEAN_RE.sub('', name.upper())[:6]
             if len(user_id) < 3:
                 user_id = f"USER{hash(name) % 1000:03d}"
 
@@ -263,13 +359,18 @@ class LicenseManager:
 
         # Generate checksum
         data_to_hash = f"AHS2025{user_id}{mac_short}{expiry_str}"
-        checksum = hashlib.md5(data_to_hash.encode()).hexdigest()[:6].upper()
+        checksum = self._checksum(data_to_hash)
 
         # Create license key
         license_key = f"AHS-2025-{user_id}-MAC{mac_short}-EXP{expiry_str}-CHK{checksum}"
 
         return license_key
 
+    @staticmethod
+    def _checksum(data: str) -> str:
+        """Six hex digit key checksum; BLAKE2b with a 3-byte digest yields exactly that"""
+        return hashlib.blake2b(data.encode(), digest_size=3).hexdigest().upper()
+
     def add_license(self, license_key: str, name: str, mac_address: str, expiry_date: str) -> bool:
         """Add a new license to the database"""
         try:
@@ -283,11 +384,13 @@ class LicenseManager:
                 'name': name,
                 'mac_address': mac_address,
                 'expiry_date': expiry_date,
-                'created_date': datetime.now().isoformat()[:10],
+                'created_date': date.today().isoformat(),
                 'user_type': 'regular'
             }
 
             # Save to file
+            self._index_license(license_key)
+            self._validation_cache.clear()
             return self._save_licenses()
 
         except Exception as e:
@@ -305,8 +408,8 @@ class LicenseManager:
                 }
             }
 
-            with open(self.license_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.license_file.write_bytes(_json_dumps_pretty(data))
+            self._validation_cache.clear()
 
             return True
 
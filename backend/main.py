@@ -5,33 +5,51 @@ Direct InfluxDB alarm extraction for real-time analysis.
 Focused on alarm event analysis with telemetry data correlation.
 """
 
+import os
 import sys
 if sys.platform == 'win32':
-    import os
     os.environ['PYTHONIOENCODING'] = 'utf-8'
-    if hasattr(sys.stdout, 'reconfigure'):
-        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
-    if hasattr(sys.stderr, 'reconfigure'):
-        sys.stderr.reconfigure(encoding='utf-8', errors='replace')
+    # Streams already in UTF-8 (e.g. when this module is imported again) are left alone
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, 'reconfigure') and (stream.encoding or '').lower() != 'utf-8':
+            stream.reconfigure(encoding='utf-8', errors='replace')
 
 import json
+import heapq
+import itertools
 import logging
+import logging.handlers
 import time
-import uuid
+from collections import OrderedDict, defaultdict
+from operator import attrgetter, itemgetter
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+import pandas as pd
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+
+    _json_dumps = orjson.dumps
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    FastJSONResponse = JSONResponse
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
 
 # Import our modules
 from alarm_extractor import AlarmDataExtractor
-from alarm_config import AlarmTypeManager
+from alarm_config import get_manager
 from license_manager import LicenseManager
 from models import (
     AlarmExtractionRequest, AlarmExtractionResponse, AlarmEvent, AlarmTelemetry,
@@ -42,48 +60,286 @@ from models import (
 # Global State Management
 # ================================
 
-# Store active alarm extractors and results
-active_extractions: Dict[str, Dict[str, Any]] = {}
-extraction_results: Dict[str, AlarmExtractionResponse] = {}
+class LRUDict(OrderedDict):
+    """Dict that forgets its least recently stored entries beyond maxsize
+
+    With an evictable predicate only values it accepts are forgotten, so the
+    dict may temporarily hold more than maxsize entries.
+    """
+
+    def __init__(self, maxsize: int, evictable: Optional[Callable[[Any], bool]] = None):
+        super().__init__()
+        self.maxsize = maxsize
+        self.evictable = evictable
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        excess = len(self) - self.maxsize
+        if excess <= 0:
+            return
+        if self.evictable is None:
+            for _ in range(excess):
+                self.popitem(last=False)
+            return
+        for old_key in [k for k, v in self.items() if self.evictable(v)][:excess]:
+            del self[old_key]
+
+_FINISHED_JOB_STATES = frozenset(('completed', 'failed'))
+
+# Store active alarm extractors and results. Job status entries are small; results hold
+# every extracted event, so only the most recent ones are kept. Pending and running jobs
+# are never evicted, as their background task still updates them
+active_extractions: Dict[str, Dict[str, Any]] = LRUDict(
+    maxsize=256, evictable=lambda job: job.get('status') in _FINISHED_JOB_STATES)
+extraction_results: Dict[str, AlarmExtractionResponse] = LRUDict(maxsize=32)
+# Serialized /results bodies of the most recently fetched results
+_result_bodies: Dict[str, bytes] = LRUDict(maxsize=4)
+
+# Job IDs are short counters; the process start time in the prefix keeps IDs from a previous run
+# from resolving to new jobs
+_job_id_prefix = f"j{int(time.time()):x}-"
+_job_counter = itertools.count(1)
+
+# Stored events grouped by vehicle plus per-vehicle response payloads, derived from
+# extraction_results on first use and dropped whenever the stored results change
+_vehicle_index: Optional[Dict[str, List[AlarmEvent]]] = None
+_vehicle_payloads: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+# /data and /alarms rows of each stored event, keyed by id(event). Stored events stay alive until
+# their result leaves extraction_results, which always clears this table
+_event_rows: Dict[int, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+_trucks_payload: Optional[Dict[str, Any]] = None
+_export_frame: Optional[pd.DataFrame] = None
+
+# Columns of /export-data records, in response order
+_EXPORT_COLUMNS = ['timestamp', 'vehicle', 'alarm_type', 'speed_kmh', 'off_path_error_m',
+                   'pitch_max_deg', 'roll_max_deg', 'latitude', 'longitude']
+_EXPORT_CHUNK_ROWS = 5000  # Records serialized per chunk of the streamed export
+_event_time = attrgetter('timestamp')
+
+def _events_by_vehicle() -> Dict[str, List[AlarmEvent]]:
+    """Stored alarm events grouped by vehicle and sorted by time, built once per change of extraction_results"""
+    global _vehicle_index
+    if _vehicle_index is None:
+        index = defaultdict(list)
+        for result in extraction_results.values():
+            for event in result.alarm_events:
+                index[event.vehicle].append(event)
+        # Sort on the datetimes themselves; ISO strings are only produced for responses
+        for events in index.values():
+            events.sort(key=_event_time)
+        _vehicle_index = dict(index)
+    return _vehicle_index
+
+def _export_events_frame() -> pd.DataFrame:
+    """Export records of all stored events as one time-ordered frame, built once per change of extraction_results"""
+    global _export_frame
+    if _export_frame is None:
+        rows = [
+            (event.timestamp.isoformat(), event.vehicle, event.alarm_type,
+             event.telemetry.speed_kmh, event.telemetry.off_path_error_m,
+             event.telemetry.pitch_max_deg, event.telemetry.roll_max_deg,
+             event.telemetry.latitude, event.telemetry.longitude)
+            # Merging the time-sorted per-vehicle lists yields all events in time order without a sort
+            for event in heapq.merge(*_events_by_vehicle().values(), key=_event_time)
+        ]
+        # Object columns keep missing telemetry as None (JSON null) rather than NaN
+        _export_frame = pd.DataFrame(rows, columns=_EXPORT_COLUMNS, dtype=object)
+    return _export_frame
+
+def _event_rows_of(event: AlarmEvent) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """The event's /data and /alarms response rows, built once per stored event"""
+    rows = _event_rows.get(id(event))
+    if rows is None:
+        timestamp = event.timestamp.isoformat()
+        telemetry = event.telemetry
+        # Format compatible with existing map component
+        data_row = {
+            "vehicle_id": event.vehicle,
+            "timestamp": timestamp,
+            "latitude": telemetry.latitude,
+            "longitude": telemetry.longitude,
+            "speed_kmh": telemetry.speed_kmh,
+            "alarm_type": event.alarm_type,
+            "alarm_title": event.title,
+            "off_path_error_m": telemetry.off_path_error_m,
+            "pitch_deg": telemetry.pitch_max_deg,  # Use max for single value
+            "roll_deg": telemetry.roll_max_deg     # Use max for single value
+        }
+        alarm_row = {
+            "alarm_id": f"{event.vehicle}_{timestamp}",
+            "alarm_type": event.alarm_type,
+            "timestamp": timestamp,
+            "vehicle_id": event.vehicle,
+            "location": {
+                "latitude": telemetry.latitude,
+                "longitude": telemetry.longitude
+            },
+            "telemetry": {
+                "speed_kmh": telemetry.speed_kmh,
+                "off_path_error_m": telemetry.off_path_error_m,
+                "pitch_deg": telemetry.pitch_max_deg,
+                "roll_deg": telemetry.roll_max_deg
+            },
+            "title": event.title,
+            "severity": "warning"  # Default severity for alarm analysis
+        }
+        rows = _event_rows[id(event)] = (data_row, alarm_row)
+    return rows
+
+def _invalidate_vehicle_index():
+    """Forget derived per-vehicle data after extraction_results changes"""
+    global _vehicle_index, _export_frame, _trucks_payload
+    _vehicle_index = None
+    _export_frame = None
+    _trucks_payload = None
+    _vehicle_payloads.clear()
+    _event_rows.clear()
+
+def _store_extraction_result(job_id: str, response: AlarmExtractionResponse):
+    """Store a finished extraction and fold its events into the per-vehicle index, keeping time order"""
+    global _export_frame, _trucks_payload
+    evicts = job_id not in extraction_results and len(extraction_results) >= extraction_results.maxsize
+    extraction_results[job_id] = response
+    if evicts or _vehicle_index is None:
+        # The evicted result's events have to leave the index, so it is rebuilt on next use
+        _invalidate_vehicle_index()
+        return
+
+    new_events = defaultdict(list)
+    for event in response.alarm_events:
+        new_events[event.vehicle].append(event)
+    for vehicle, events in new_events.items():
+        vehicle_events = _vehicle_index.setdefault(vehicle, [])
+        vehicle_events.extend(events)
+        # Timsort merges the already sorted run with the new one in about linear time
+        vehicle_events.sort(key=_event_time)
+        _vehicle_payloads.pop(('data', vehicle), None)
+        _vehicle_payloads.pop(('alarms', vehicle), None)
+    _export_frame = None
+    _trucks_payload = None
 
 # Initialize alarm type manager (JSON file-based storage)
-alarm_manager = AlarmTypeManager()
+alarm_manager = get_manager()
+
+def _flush_alarm_config() -> bool:
+    """Write coalesced alarm config changes to disk before an endpoint reports success"""
+    try:
+        alarm_manager.flush_now()
+        return True
+    except Exception as e:
+        logger.error(f"Failed to save alarm config: {e}")
+        return False
 
 # Initialize license manager
 license_manager = LicenseManager()
 
+# Validates a whole extraction's events in one call into pydantic-core
+_ALARM_EVENT_LIST = TypeAdapter(List[AlarmEvent])
+_TELEMETRY_FIELDS = tuple(AlarmTelemetry.model_fields)
+_telemetry_values = itemgetter(*_TELEMETRY_FIELDS)
+
+def _telemetry_of(event_raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Telemetry fields of a raw event, fetched with one C-level itemgetter call"""
+    try:
+        return dict(zip(_TELEMETRY_FIELDS, _telemetry_values(event_raw)))
+    except KeyError:  # Event without the full telemetry set
+        return {field: event_raw.get(field) for field in _TELEMETRY_FIELDS}
+
+def _to_alarm_models(alarm_events_raw: List[Dict[str, Any]]) -> Tuple[List[AlarmEvent], set, set]:
+    """Validate raw events as Pydantic models in one batch, collecting vehicles and alarm types as they are nested"""
+    nested, vehicles_seen, alarm_types_seen = [], set(), set()
+    for event_raw in alarm_events_raw:
+        vehicles_seen.add(event_raw['vehicle'])
+        alarm_types_seen.add(event_raw['alarm_type'])
+        nested.append({
+            'alarm_type': event_raw['alarm_type'],
+            'vehicle': event_raw['vehicle'],
+            'timestamp': event_raw['timestamp'],
+            'title': event_raw['title'],
+            'telemetry': _telemetry_of(event_raw)
+        })
+    return _ALARM_EVENT_LIST.validate_python(nested), vehicles_seen, alarm_types_seen
+
 # ================================
 # FastAPI Application Setup
 # ================================
 
+# Frontend log lines waiting to be appended by the background writer; None outside the app lifespan
+_frontend_log_queue: Optional[asyncio.Queue] = None
+_FRONTEND_LOG_BATCH = 256  # Maximum lines appended per file open
+
+def _append_frontend_log(text: str):
+    """Append already formatted lines to the frontend log file"""
+    os.makedirs('logs', exist_ok=True)
+    with open('logs/frontend.log', 'a', encoding='utf-8') as f:
+        f.write(text)
+
+async def _frontend_log_writer(queue: asyncio.Queue):
+    """Drain queued frontend log lines in batches, one file open per batch, until None arrives"""
+    while True:
+        batch = [await queue.get()]
+        while len(batch) < _FRONTEND_LOG_BATCH and not queue.empty():
+            batch.append(queue.get_nowait())
+
+        stop = None in batch
+        lines = [line for line in batch if line is not None]
+        if lines:
+            try:
+                await asyncio.to_thread(_append_frontend_log, ''.join(lines))
+            except Exception as e:
+                logging.error(f"Failed to save frontend log: {e}")
+        if stop:
+            return
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
     # Startup
+    global _frontend_log_queue
     logging.info("[STARTUP] Mining Truck Alarm Analysis API v1.0.0")
+    _frontend_log_queue = asyncio.Queue()
+    log_writer = asyncio.create_task(_frontend_log_writer(_frontend_log_queue))
     yield
     # Shutdown
+    _frontend_log_queue.put_nowait(None)  # Writer flushes what is queued, then stops
+    await log_writer
+    _frontend_log_queue = None
+    _flush_alarm_config()
+    AlarmDataExtractor.clear_telemetry_cache()  # Drop cached InfluxDB telemetry windows
     logging.info("[SHUTDOWN] Closing alarm analysis API")
 
 app = FastAPI(
     title="Mining Truck Alarm Analysis API",
     description="Extract and analyze mining truck alarm events with telemetry data",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
+# Explicit origins let the middleware answer from a fixed allow-list instead of echoing every origin.
+# ALLOWED_ORIGINS (comma separated) pins the list; otherwise the frontend is allowed on port 3000
+# from localhost and private LAN addresses so network access keeps working
+_allowed_origins = [origin.strip() for origin in os.environ.get('ALLOWED_ORIGINS', '').split(',') if origin.strip()]
+_PRIVATE_FRONTEND_ORIGINS = (
+    r"http://(10(\.\d{1,3}){3}|192\.168(\.\d{1,3}){2}|172\.(1[6-9]|2\d|3[01])(\.\d{1,3}){2}):3000"
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for network access
+    allow_origins=_allowed_origins or ["http://localhost:3000", "http://127.0.0.1:3000"],
+    allow_origin_regex=None if _allowed_origins else _PRIVATE_FRONTEND_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["content-type", "authorization"],
 )
 
+# Compress larger responses (event lists, exports) for clients that accept gzip; the repetitive
+# JSON shrinks several-fold, and streamed exports are compressed chunk by chunk
+app.add_middleware(GZipMiddleware, minimum_size=2048, compresslevel=5)
+
 # Setup logging
 # Configure logging to both console and file
-import os
 os.makedirs('logs', exist_ok=True)
 
 logging.basicConfig(
@@ -91,7 +347,8 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(sys.stdout),  # Console output
-        logging.FileHandler('logs/backend.log', encoding='utf-8')  # File output
+        # File output, opened on first record and rotated at 10 MB (5 backups kept)
+        logging.handlers.RotatingFileHandler('logs/backend.log', maxBytes=10_000_000, backupCount=5, encoding='utf-8', delay=True)
     ]
 )
 logger = logging.getLogger(__name__)
@@ -121,15 +378,16 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 def create_extraction_job(request: AlarmExtractionRequest) -> str:
     """Create a new extraction job and return job ID"""
-    job_id = str(uuid.uuid4())
+    job_id = f"{_job_id_prefix}{next(_job_counter):x}"
     
     active_extractions[job_id] = {
         'status': 'pending',
         'message': 'Extraction job created',
         'progress': 0,
-        'start_time': datetime.utcnow(),
+        'start_time': datetime.now(timezone.utc),
         'request': request,
-        'alarm_events': [],
+        'alarm_events_found': 0,
+        'vehicles_found': 0,
         'current_operation': 'Initializing alarm extraction'
     }
     
@@ -161,25 +419,26 @@ async def run_alarm_extraction(job_id: str):
             custom_alarm_types=custom_types,
             query_delay=extraction_settings.get('query_delay_seconds', 0.1),
             max_points_per_query=extraction_settings.get('max_points_per_query', 1000),
-            telemetry_window=extraction_settings.get('telemetry_window_seconds', 0.5)
+            telemetry_window=extraction_settings.get('telemetry_window_seconds', 0.5),
+            required_channels=alarm_manager.get_alarm_type_channels()
         )
 
-        
-        # Connect to InfluxDB
-        if not extractor.connect():
-            raise Exception("Failed to connect to InfluxDB")
-        
-        active_extractions[job_id].update({
-            'message': 'Connected to InfluxDB, extracting alarm events...',
-            'progress': 20,
-            'current_operation': 'Extracting alarm events from time range'
-        })
-        
         try:
+            # Connect to InfluxDB; blocking work runs in worker threads so the API stays responsive
+            if not await asyncio.to_thread(extractor.connect):
+                raise Exception("Failed to connect to InfluxDB")
+
+            active_extractions[job_id].update({
+                'message': 'Connected to InfluxDB, extracting alarm events...',
+                'progress': 20,
+                'current_operation': 'Extracting alarm events from time range'
+            })
+
             # Extract alarm events
             start_time = time.time()
 
-            alarm_events_raw = extractor.extract_alarm_events(
+            alarm_events_raw = await asyncio.to_thread(
+                extractor.extract_alarm_events,
                 start_time=request.time_range.start,
                 end_time=request.time_range.end,
                 selected_alarms=request.alarm_filter.selected_alarms,
@@ -189,32 +448,12 @@ async def run_alarm_extraction(job_id: str):
             
             extraction_time = time.time() - start_time
             
-            # Convert raw events to Pydantic models
-            alarm_events = []
-            for event_raw in alarm_events_raw:
-                telemetry = AlarmTelemetry(
-                    latitude=event_raw.get('latitude'),
-                    longitude=event_raw.get('longitude'),
-                    speed_kmh=event_raw.get('speed_kmh'),
-                    off_path_error_m=event_raw.get('off_path_error_m'),
-                    pitch_min_deg=event_raw.get('pitch_min_deg'),
-                    pitch_max_deg=event_raw.get('pitch_max_deg'),
-                    roll_min_deg=event_raw.get('roll_min_deg'),
-                    roll_max_deg=event_raw.get('roll_max_deg')
-                )
-                
-                alarm_event = AlarmEvent(
-                    alarm_type=event_raw['alarm_type'],
-                    vehicle=event_raw['vehicle'],
-                    timestamp=event_raw['timestamp'],
-                    title=event_raw['title'],
-                    telemetry=telemetry
-                )
-                alarm_events.append(alarm_event)
+            # Convert raw events to Pydantic models, gathering summary sets in the same pass
+            alarm_events, vehicles_seen, alarm_types_seen = await asyncio.to_thread(_to_alarm_models, alarm_events_raw)
             
             # Create summary statistics
-            unique_vehicles = list(set(event['vehicle'] for event in alarm_events_raw))
-            alarm_types_found = list(set(event['alarm_type'] for event in alarm_events_raw))
+            unique_vehicles = list(vehicles_seen)
+            alarm_types_found = list(alarm_types_seen)
             
             summary = {
                 'total_events': len(alarm_events),
@@ -235,26 +474,25 @@ async def run_alarm_extraction(job_id: str):
             )
             
             # Store result and update job status
-            extraction_results[job_id] = response
+            _store_extraction_result(job_id, response)
             active_extractions[job_id].update({
                 'status': 'completed',
                 'message': f'Completed: {len(alarm_events)} alarm events extracted',
                 'progress': 100,
-                'alarm_events': alarm_events,
+                'alarm_events_found': len(alarm_events),  # Events themselves live in extraction_results
+                'vehicles_found': len(unique_vehicles),
                 'summary': summary,
                 'current_operation': 'Alarm extraction completed successfully'
             })
-
-            # Cleanup extractor instance
-            try:
-                extractor.disconnect()
-            except Exception as e:
-                logger.warning(f"Error disconnecting extractor after completion: {e}")
             
             logger.info(f"Extraction job {job_id} completed successfully: {len(alarm_events)} events")
             
         finally:
-            extractor.disconnect()
+            # Single cleanup point for the extractor instance, whether the job completed or failed
+            try:
+                extractor.disconnect()
+            except Exception as e:
+                logger.warning(f"Error disconnecting extractor: {e}")
             
     except Exception as e:
         error_msg = f"Extraction failed: {str(e)}"
@@ -266,12 +504,6 @@ async def run_alarm_extraction(job_id: str):
             'current_operation': f'Failed: {str(e)}'
         })
 
-        # Cleanup extractor instance on failure
-        try:
-            extractor.disconnect()
-        except Exception as cleanup_error:
-            logger.warning(f"Error disconnecting extractor after failure: {cleanup_error}")
-
 # ================================
 # API Endpoints
 # ================================
@@ -283,7 +515,7 @@ async def root():
         return {
             "status": "healthy",
             "message": "Mining Truck Alarm Analysis API is running",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "version": "1.0.0",
             "active_extractions": len(active_extractions)
         }
@@ -338,9 +570,9 @@ async def get_extraction_status(job_id: str):
         "message": job_data.get('message', ''),
         "progress": job_data.get('progress', 0),
         "current_operation": job_data.get('current_operation', ''),
-        "alarm_events_found": len(job_data.get('alarm_events', [])),
-        "vehicles_found": len(set(event.vehicle for event in job_data.get('alarm_events', []))),
-        "data_points_extracted": len(job_data.get('alarm_events', []))  # For compatibility with frontend
+        "alarm_events_found": job_data.get('alarm_events_found', 0),
+        "vehicles_found": job_data.get('vehicles_found', 0),
+        "data_points_extracted": job_data.get('alarm_events_found', 0)  # For compatibility with frontend
     }
 
 
@@ -349,12 +581,21 @@ async def get_extraction_results(job_id: str):
     """Get extraction results"""
     if job_id not in extraction_results:
         raise HTTPException(status_code=404, detail="Extraction results not found")
-    
-    return extraction_results[job_id]
+
+    # Results are server-built models: serialize once in pydantic-core and skip response validation
+    body = _result_bodies.get(job_id)
+    if body is None:
+        body = _result_bodies[job_id] = extraction_results[job_id].model_dump_json().encode('utf-8')
+    return Response(body, media_type="application/json")
 
 @app.get("/trucks")
 async def get_available_trucks():
     """Get available trucks from recent extractions"""
+    # The list only changes when extraction results are stored or cleared
+    global _trucks_payload
+    if _trucks_payload is not None:
+        return _trucks_payload
+
     # For alarm analysis, we return vehicles from recent extraction results
     all_vehicles = set()
     
@@ -370,74 +611,42 @@ async def get_available_trucks():
         for vehicle in sorted(all_vehicles)
     ]
     
-    return {
+    _trucks_payload = {
         "vehicles": vehicles,
         "count": len(vehicles),
         "status": "success"
     }
+    return _trucks_payload
 
-@app.get("/data/{vehicle_id}")
+@app.get("/data/{vehicle_id}", response_class=FastJSONResponse)
 async def get_vehicle_alarm_data(vehicle_id: str):
     """Get alarm data for specific vehicle"""
-    vehicle_alarms = []
+    vehicle_alarms = _vehicle_payloads.get(('data', vehicle_id))
+    if vehicle_alarms is None:
+        # Collect alarms for this vehicle from all extraction results
+        vehicle_alarms = [_event_rows_of(event)[0] for event in _events_by_vehicle().get(vehicle_id, ())]
+        _vehicle_payloads[('data', vehicle_id)] = vehicle_alarms
     
-    # Collect alarms for this vehicle from all extraction results
-    for result in extraction_results.values():
-        for event in result.alarm_events:
-            if event.vehicle == vehicle_id:
-                # Convert to format compatible with existing map component
-                alarm_data = {
-                    "vehicle_id": event.vehicle,
-                    "timestamp": event.timestamp.isoformat(),
-                    "latitude": event.telemetry.latitude,
-                    "longitude": event.telemetry.longitude,
-                    "speed_kmh": event.telemetry.speed_kmh,
-                    "alarm_type": event.alarm_type,
-                    "alarm_title": event.title,
-                    "off_path_error_m": event.telemetry.off_path_error_m,
-                    "pitch_deg": event.telemetry.pitch_max_deg,  # Use max for single value
-                    "roll_deg": event.telemetry.roll_max_deg     # Use max for single value
-                }
-                vehicle_alarms.append(alarm_data)
-    
-    return {
-        "data": sorted(vehicle_alarms, key=lambda x: x["timestamp"]),
+    # Returned as a response directly: the payload is plain JSON data, so jsonable_encoder is skipped
+    return FastJSONResponse({
+        "data": vehicle_alarms,
         "count": len(vehicle_alarms),
         "vehicle_id": vehicle_id
-    }
+    })
 
-@app.get("/alarms/{vehicle_id}")
+@app.get("/alarms/{vehicle_id}", response_class=FastJSONResponse)
 async def get_vehicle_alarms(vehicle_id: str):
     """Get alarm-specific data for vehicle"""
-    vehicle_alarms = []
+    vehicle_alarms = _vehicle_payloads.get(('alarms', vehicle_id))
+    if vehicle_alarms is None:
+        vehicle_alarms = [_event_rows_of(event)[1] for event in _events_by_vehicle().get(vehicle_id, ())]
+        _vehicle_payloads[('alarms', vehicle_id)] = vehicle_alarms
     
-    for result in extraction_results.values():
-        for event in result.alarm_events:
-            if event.vehicle == vehicle_id:
-                vehicle_alarms.append({
-                    "alarm_id": f"{event.vehicle}_{event.timestamp.isoformat()}",
-                    "alarm_type": event.alarm_type,
-                    "timestamp": event.timestamp.isoformat(),
-                    "vehicle_id": event.vehicle,
-                    "location": {
-                        "latitude": event.telemetry.latitude,
-                        "longitude": event.telemetry.longitude
-                    },
-                    "telemetry": {
-                        "speed_kmh": event.telemetry.speed_kmh,
-                        "off_path_error_m": event.telemetry.off_path_error_m,
-                        "pitch_deg": event.telemetry.pitch_max_deg,
-                        "roll_deg": event.telemetry.roll_max_deg
-                    },
-                    "title": event.title,
-                    "severity": "warning"  # Default severity for alarm analysis
-                })
-    
-    return {
-        "alarms": sorted(vehicle_alarms, key=lambda x: x["timestamp"]),
+    return FastJSONResponse({
+        "alarms": vehicle_alarms,
         "count": len(vehicle_alarms),
         "vehicle_id": vehicle_id
-    }
+    })
 
 @app.delete("/clear-database")
 async def clear_extraction_data():
@@ -449,6 +658,8 @@ async def clear_extraction_data():
     
     active_extractions.clear()
     extraction_results.clear()
+    _result_bodies.clear()
+    _invalidate_vehicle_index()
     
     return {
         "status": "success",
@@ -459,36 +670,28 @@ async def clear_extraction_data():
 @app.delete("/clear-logs")
 async def clear_logs():
     """Clear application logs"""
-    import os
     import glob
 
+    def truncate_log(log_file: str, label: str) -> bool:
+        # Clear the file content instead of deleting to avoid permission issues
+        try:
+            os.truncate(log_file, 0)
+            logger.info(f"Cleared {label}: {log_file}")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not clear {label} {log_file}: {e}")
+            return False
+
     try:
-        logs_cleared = 0
-
-        # Clear logs in the backend/logs directory
-        logs_dir = os.path.join(os.path.dirname(__file__), 'logs')
-        if os.path.exists(logs_dir):
-            log_files = glob.glob(os.path.join(logs_dir, '*.log'))
-            for log_file in log_files:
-                try:
-                    # Clear the file content instead of deleting to avoid permission issues
-                    with open(log_file, 'w') as f:
-                        f.write('')
-                    logs_cleared += 1
-                    logger.info(f"Cleared log file: {log_file}")
-                except Exception as e:
-                    logger.warning(f"Could not clear log file {log_file}: {e}")
-
-        # Clear any root level log files
-        root_log_files = glob.glob(os.path.join(os.path.dirname(__file__), '*.log'))
-        for log_file in root_log_files:
-            try:
-                with open(log_file, 'w') as f:
-                    f.write('')
-                logs_cleared += 1
-                logger.info(f"Cleared root log file: {log_file}")
-            except Exception as e:
-                logger.warning(f"Could not clear root log file {log_file}: {e}")
+        # Logs in the backend/logs directory, then any root level log files
+        backend_dir = os.path.dirname(__file__)
+        logs_dir = os.path.join(backend_dir, 'logs')
+        log_files = [(log_file, 'log file') for log_file in glob.glob(os.path.join(logs_dir, '*.log'))]
+        log_files += [(log_file, 'root log file') for log_file in glob.glob(os.path.join(backend_dir, '*.log'))]
+
+        # One truncate call per file, all dispatched off the event loop together
+        results = await asyncio.gather(*(asyncio.to_thread(truncate_log, log_file, label) for log_file, label in log_files))
+        logs_cleared = sum(results)
 
         message = f"Successfully cleared {logs_cleared} log files"
         logger.info(f"LOG CLEARING: {message}")
@@ -512,17 +715,18 @@ async def clear_logs():
 async def save_frontend_log(log_data: dict):
     """Save frontend log entry to file"""
     try:
-        import os
-        os.makedirs('logs', exist_ok=True)
-
-        with open('logs/frontend.log', 'a', encoding='utf-8') as f:
-            timestamp = log_data.get('timestamp', '')
-            level = log_data.get('level', 'info').upper()
-            component = log_data.get('component', 'unknown')
-            action = log_data.get('action', 'unknown')
-            message = log_data.get('message', '')
-
-            f.write(f"{timestamp} - FRONTEND-{level} - {component}::{action} - {message}\n")
+        timestamp = log_data.get('timestamp', '')
+        level = log_data.get('level', 'info').upper()
+        component = log_data.get('component', 'unknown')
+        action = log_data.get('action', 'unknown')
+        message = log_data.get('message', '')
+        line = f"{timestamp} - FRONTEND-{level} - {component}::{action} - {message}\n"
+
+        # Queued for the background writer so the request never waits on disk
+        if _frontend_log_queue is not None:
+            _frontend_log_queue.put_nowait(line)
+        else:
+            _append_frontend_log(line)
 
         return {"status": "success"}
     except Exception as e:
@@ -596,7 +800,7 @@ async def set_alarm_types(request: Dict[str, List[str]]):
             raise HTTPException(status_code=400, detail="No valid alarm types provided")
         
         # Update alarm types using manager
-        success = alarm_manager.set_alarm_types(valid_types)
+        success = alarm_manager.set_alarm_types(valid_types) and _flush_alarm_config()
         if not success:
             raise HTTPException(status_code=500, detail="Failed to save alarm types to configuration")
         
@@ -630,7 +834,7 @@ async def add_alarm_type(request: Dict[str, str]):
             raise HTTPException(status_code=409, detail=f"Alarm type '{alarm_type}' already exists")
         
         # Add using manager
-        success = alarm_manager.add_alarm_type(alarm_type)
+        success = alarm_manager.add_alarm_type(alarm_type) and _flush_alarm_config()
         if not success:
             raise HTTPException(status_code=500, detail="Failed to add alarm type to configuration")
         
@@ -667,7 +871,7 @@ async def remove_alarm_type(alarm_type: str):
             raise HTTPException(status_code=404, detail=f"Alarm type '{alarm_type}' not found")
         
         # Remove using manager
-        success = alarm_manager.remove_alarm_type(alarm_type)
+        success = alarm_manager.remove_alarm_type(alarm_type) and _flush_alarm_config()
         if not success:
             raise HTTPException(status_code=500, detail="Failed to remove alarm type from configuration")
         
@@ -694,7 +898,7 @@ async def reset_alarm_types():
     """Reset alarm types to factory defaults"""
     try:
         # Reset to defaults using manager
-        success = alarm_manager.reset_to_defaults()
+        success = alarm_manager.reset_to_defaults() and _flush_alarm_config()
         if not success:
             raise HTTPException(status_code=500, detail="Failed to reset alarm types to defaults")
         
@@ -747,7 +951,7 @@ async def update_extraction_settings(request: Dict):
             raise HTTPException(status_code=400, detail="extraction_settings must be a dictionary")
 
         # Update settings using manager
-        success = alarm_manager.update_extraction_settings(settings)
+        success = alarm_manager.update_extraction_settings(settings) and _flush_alarm_config()
         if not success:
             raise HTTPException(status_code=500, detail="Failed to save extraction settings to configuration")
 
@@ -868,10 +1072,12 @@ async def generate_license(request: Dict[str, str], admin_key: str):
         raise HTTPException(status_code=500, detail=f"License generation failed: {str(e)}")
 
 @app.get("/system-info")
-async def get_system_info():
+async def get_system_info(response: Response):
     """Get system MAC addresses for license binding"""
     try:
         mac_addresses = license_manager.get_machine_mac_addresses()
+        # Browsers may reuse the answer for as long as the license manager caches the addresses
+        response.headers["Cache-Control"] = f"private, max-age={int(LicenseManager.MAC_CACHE_TTL)}"
 
         return {
             "status": "success",
@@ -899,54 +1105,67 @@ class ExportRequest(BaseModel):
 def point_in_polygon(point_lat: float, point_lon: float, polygon_coords: List[List[float]]) -> bool:
     """Check if a point is inside a polygon using ray casting algorithm"""
     x, y = point_lon, point_lat
-    n = len(polygon_coords)
     inside = False
 
-    p1x, p1y = polygon_coords[0]
-    for i in range(1, n + 1):
-        p2x, p2y = polygon_coords[i % n]
-        if y > min(p1y, p2y):
-            if y <= max(p1y, p2y):
-                if x <= max(p1x, p2x):
-                    if p1y != p2y:
-                        xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                    if p1x == p2x or x <= xinters:
-                        inside = not inside
+    # Walk the edges (previous vertex -> vertex), closing the ring back to the first vertex
+    p1x, p1y = polygon_coords[-1]
+    for p2x, p2y in polygon_coords:
+        # Edge straddles the ray's height: exactly one endpoint lies above y
+        if (p1y < y) != (p2y < y):
+            # Crossing point of the edge with the horizontal through y
+            if x <= (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x:
+                inside = not inside
         p1x, p1y = p2x, p2y
 
     return inside
 
+# Outer rings of the last GeoJSON searched, with bounding boxes: (geo_json_data, [(name, bbox, ring)])
+_shape_index_cache: Tuple[Optional[Dict[str, Any]], List[Tuple[str, Tuple[float, float, float, float], List[List[float]]]]] = (None, [])
+
+def _shape_index(geo_json_data: Dict[str, Any]) -> List[Tuple[str, Tuple[float, float, float, float], List[List[float]]]]:
+    """Named outer rings with their bounding boxes, in feature order; rebuilt only for a new GeoJSON object"""
+    global _shape_index_cache
+    if _shape_index_cache[0] is geo_json_data:
+        return _shape_index_cache[1]
+
+    shapes = []
+    for feature in geo_json_data.get('features', []):
+        geometry = feature.get('geometry', {})
+        properties = feature.get('properties', {})
+        # AsiName or fallback to other name properties
+        name = (properties.get('AsiName') or
+                properties.get('Name') or
+                properties.get('name') or
+                'Unnamed Shape')
+
+        if geometry.get('type') == 'Polygon':
+            polygons = [geometry.get('coordinates', [[]])]
+        elif geometry.get('type') == 'MultiPolygon':
+            polygons = geometry.get('coordinates', [])
+        else:
+            continue
+
+        for polygon_coords in polygons:
+            if polygon_coords and len(polygon_coords) > 0 and polygon_coords[0]:
+                ring = polygon_coords[0]
+                lons = [point[0] for point in ring]
+                lats = [point[1] for point in ring]
+                shapes.append((name, (min(lats), min(lons), max(lats), max(lons)), ring))
+
+    _shape_index_cache = (geo_json_data, shapes)
+    return shapes
+
 def find_shape_name(lat: float, lon: float, geo_json_data: Dict[str, Any]) -> str:
     """Find which shape (AsiName) contains the given coordinates"""
     if not geo_json_data or not lat or not lon:
         return ''
 
     try:
-        features = geo_json_data.get('features', [])
-        for feature in features:
-            geometry = feature.get('geometry', {})
-            properties = feature.get('properties', {})
-
-            if geometry.get('type') == 'Polygon':
-                coords = geometry.get('coordinates', [[]])
-                if coords and len(coords) > 0:
-                    # Check if point is in this polygon
-                    if point_in_polygon(lat, lon, coords[0]):
-                        # Return AsiName or fallback to other name properties
-                        return (properties.get('AsiName') or
-                               properties.get('Name') or
-                               properties.get('name') or
-                               'Unnamed Shape')
-
-            elif geometry.get('type') == 'MultiPolygon':
-                multi_coords = geometry.get('coordinates', [])
-                for polygon_coords in multi_coords:
-                    if polygon_coords and len(polygon_coords) > 0:
-                        if point_in_polygon(lat, lon, polygon_coords[0]):
-                            return (properties.get('AsiName') or
-                                   properties.get('Name') or
-                                   properties.get('name') or
-                                   'Unnamed Shape')
+        for name, (min_lat, min_lon, max_lat, max_lon), ring in _shape_index(geo_json_data):
+            # A point outside the bounding box cannot be inside the polygon
+            if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+                if point_in_polygon(lat, lon, ring):
+                    return name
 
         return ''  # Point not found in any shape
 
@@ -972,38 +1191,27 @@ async def get_export_data(
 
         logger.info(f"Export data request: {len(selected_vehicles)} vehicles, {len(selected_alarms)} alarms")
 
-        # Collect all alarm events that match filters
-        filtered_events = []
-
-        for result in extraction_results.values():
-            for event in result.alarm_events:
-                # Filter by vehicle if specified
-                if selected_vehicles and event.vehicle not in selected_vehicles:
-                    continue
-
-                # Filter by alarm type if specified
-                if selected_alarms and event.alarm_type not in selected_alarms:
-                    continue
-
-                # Create event data for frontend processing
-                event_data = {
-                    'timestamp': event.timestamp.isoformat(),
-                    'vehicle': event.vehicle,
-                    'alarm_type': event.alarm_type,
-                    'speed_kmh': event.telemetry.speed_kmh,
-                    'off_path_error_m': event.telemetry.off_path_error_m,
-                    'pitch_max_deg': event.telemetry.pitch_max_deg,
-                    'roll_max_deg': event.telemetry.roll_max_deg,
-                    'latitude': event.telemetry.latitude,
-                    'longitude': event.telemetry.longitude
-                }
-                filtered_events.append(event_data)
-
-        # Sort by timestamp
-        filtered_events.sort(key=lambda x: x['timestamp'])
-
-        logger.info(f"Returning {len(filtered_events)} alarm events for export")
-        return filtered_events
+        # Filter the pre-sorted export frame with column masks
+        frame = _export_events_frame()
+        if selected_vehicles:
+            frame = frame[frame['vehicle'].isin(selected_vehicles)]
+        if selected_alarms:
+            frame = frame[frame['alarm_type'].isin(selected_alarms)]
+
+        logger.info(f"Returning {len(frame)} alarm events for export")
+
+        # Stream the records (already sorted by timestamp) as one JSON array, a chunk at a time,
+        # so the full payload is never held in memory
+        async def stream_records():
+            yield b'['
+            separator = b''
+            for start in range(0, len(frame), _EXPORT_CHUNK_ROWS):
+                records = frame.iloc[start:start + _EXPORT_CHUNK_ROWS].to_dict(orient='records')
+                yield separator + _json_dumps(records)[1:-1]
+                separator = b','
+            yield b']'
+
+        return StreamingResponse(stream_records(), media_type='application/json')
 
     except Exception as e:
         logger.error(f"Error getting export data: {e}")
@@ -19,9 +19,16 @@ from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Callable
 from contextlib import asynccontextmanager
 import json
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+
+def _parse_influx_times(points: List[Dict]) -> List[Optional[datetime]]:
+    """Parse every point's RFC3339 'time' in one vectorized call; unparseable entries become None"""
+    parsed = pd.to_datetime([point.get('time') for point in points], utc=True, format='ISO8601', errors='coerce')
+    return [None if pd.isna(ts) else ts for ts in parsed.floor('us').to_pydatetime()]
+
 class MemoryOptimizer:
     """
     Memory optimization and pressure management system
@@ -224,7 +231,7 @@ class MemoryOptimizer:
                 'process_memory_mb': round(process.memory_info().rss / (1024**2), 1),
                 'process_memory_percent': round(process.memory_percent(), 1),
                 'gc_counts': gc.get_count(),
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': datetime.now(timezone.utc).isoformat()
             }
         except Exception as e:
             logger.error(f"Failed to get memory stats: {e}")
@@ -250,20 +257,18 @@ class BulkDatabaseOperations:
         
         # Prepare bulk data
         bulk_data = []
-        for point in points:
-            try:
-                timestamp = datetime.fromisoformat(point['time'].replace('Z', '+00:00'))
-                bulk_data.append([
-                    vehicle_id, 
-                    timestamp, 
-                    timestamp,  # timestamp_perth will be calculated by DB
-                    point.get('Value.Latitude'), 
-                    point.get('Value.Longitude'), 
-                    session_id
-                ])
-            except Exception as e:
-                logger.warning(f"Skipping invalid GPS point: {e}")
+        for point, timestamp in zip(points, _parse_influx_times(points)):
+            if timestamp is None:
+                logger.warning(f"Skipping invalid GPS point: bad time {point.get('time')!r}")
                 continue
+            bulk_data.append([
+                vehicle_id, 
+                timestamp, 
+                timestamp,  # timestamp_perth will be calculated by DB
+                point.get('Value.Latitude'), 
+                point.get('Value.Longitude'), 
+                session_id
+            ])
         
         if bulk_data:
             # Single bulk insert instead of thousands of individual inserts
@@ -281,19 +286,17 @@ class BulkDatabaseOperations:
             return
         
         bulk_data = []
-        for point in points:
-            try:
-                timestamp = datetime.fromisoformat(point['time'].replace('Z', '+00:00'))
-                bulk_data.append([
-                    vehicle_id, 
-                    timestamp, 
-                    timestamp,  # timestamp_perth calculated by DB
-                    point.get('Value'), 
-                    session_id
-                ])
-            except Exception as e:
-                logger.warning(f"Skipping invalid speed point: {e}")
+        for point, timestamp in zip(points, _parse_influx_times(points)):
+            if timestamp is None:
+                logger.warning(f"Skipping invalid speed point: bad time {point.get('time')!r}")
                 continue
+            bulk_data.append([
+                vehicle_id, 
+                timestamp, 
+                timestamp,  # timestamp_perth calculated by DB
+                point.get('Value'), 
+                session_id
+            ])
         
         if bulk_data:
             conn.executemany(f"""
@@ -310,19 +313,17 @@ class BulkDatabaseOperations:
             return
         
         bulk_data = []
-        for point in points:
-            try:
-                timestamp = datetime.fromisoformat(point['time'].replace('Z', '+00:00'))
-                bulk_data.append([
-                    vehicle_id, 
-                    timestamp, 
-                    timestamp,  # timestamp_perth calculated by DB
-                    point.get('Value'), 
-                    session_id
-                ])
-            except Exception as e:
-                logger.warning(f"Skipping invalid state point: {e}")
+        for point, timestamp in zip(points, _parse_influx_times(points)):
+            if timestamp is None:
+                logger.warning(f"Skipping invalid state point: bad time {point.get('time')!r}")
                 continue
+            bulk_data.append([
+                vehicle_id, 
+                timestamp, 
+                timestamp,  # timestamp_perth calculated by DB
+                point.get('Value'), 
+                session_id
+            ])
         
         if bulk_data:
             conn.executemany(f"""
@@ -339,9 +340,10 @@ class BulkDatabaseOperations:
             return
         
         bulk_data = []
-        for point in points:
+        for point, timestamp in zip(points, _parse_influx_times(points)):
             try:
-                timestamp = datetime.fromisoformat(point['time'].replace('Z', '+00:00'))
+                if timestamp is None:
+                    raise ValueError(f"bad time {point.get('time')!r}")
                 
                 # Parse position data
                 position_data = point.get('Value')
@@ -11,6 +11,11 @@ from datetime import datetime, timezone
 from enum import Enum
 import re
 
+
+def utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
 # ================================
 # Enums for Type Safety
 # ================================
@@ -393,7 +398,7 @@ class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error type")
     message: str = Field(..., description="Error message")
     details: Optional[str] = Field(None, description="Additional error details")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Error timestamp")
+    timestamp: datetime = Field(default_factory=utc_now, description="Error timestamp")
     request_id: Optional[str] = Field(None, description="Request identifier for tracking")
 
     class Config:
@@ -428,7 +433,7 @@ class SuccessResponse(BaseModel):
     """Generic success response"""
     status: str = Field("success", description="Operation status")
     message: str = Field(..., description="Success message")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Response timestamp")
+    timestamp: datetime = Field(default_factory=utc_now, description="Response timestamp")
     data: Optional[Dict[str, Any]] = Field(None, description="Additional response data")
 
 class SessionInfo(BaseModel):
@@ -108,7 +108,7 @@ class ResourceMonitor:
             
             # Aggregate status
             status = {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': datetime.now(timezone.utc).isoformat(),
                 'disk': disk_status,
                 'memory': memory_status,
                 'cpu': cpu_status,
@@ -129,7 +129,7 @@ class ResourceMonitor:
         except Exception as e:
             logger.error(f"Failed to check resources: {e}")
             return {
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': datetime.now(timezone.utc).isoformat(),
                 'error': str(e),
                 'overall_status': 'error'
             }